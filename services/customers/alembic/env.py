@@ -8,7 +8,8 @@ import os, sys
 config = context.config
 
 # Interpret the config file for Python logging.
-if config.config_file_name is not None:
+# In-process upgrades from the service lifespan keep the app's logging setup
+if config.config_file_name is not None and config.attributes.get("configure_logger", True):
     fileConfig(config.config_file_name)
 
 # Add model metadata
@@ -13,10 +13,11 @@ def list_customers(
     db: Session = Depends(get_db),
     skip: int = Query(0, ge=0, description="Number of records to skip"),
     limit: int = Query(100, ge=1, le=1000, description="Maximum number of records to return"),
-    name: Optional[str] = Query(None, max_length=100, description="Filter by customer name")
+    name: Optional[str] = Query(None, max_length=100, description="Filter by customer name"),
+    ids: Optional[str] = Query(None, pattern=r"^\d+(,\d+)*$", description="Comma-separated ids to fetch in one call")
 ):
     """List customers with optional filtering and pagination"""
-    customers = CustomerService(db).list()
+    customers = CustomerService(db).list([int(i) for i in ids.split(",")] if ids else None)
     
     # Apply name filter if provided (safe string comparison, no SQL injection)
     if name:
@@ -27,7 +28,7 @@ def list_customers(
 
 @router.get("/{customer_id}", response_model=CustomerRead)
 def get_customer(customer_id: int, db: Session = Depends(get_db)):
-    customer = db.query(Customer).filter(Customer.id == customer_id).first()
+    customer = db.get(Customer, customer_id)
     if not customer:
         raise HTTPException(status_code=404, detail="Customer not found")
     return customer
@@ -38,7 +39,7 @@ def create_customer(payload: CustomerCreate, db: Session = Depends(get_db)):
 
 @router.put("/{customer_id}", response_model=CustomerRead)
 def update_customer(customer_id: int, payload: CustomerCreate, db: Session = Depends(get_db)):
-    customer = db.query(Customer).filter(Customer.id == customer_id).first()
+    customer = db.get(Customer, customer_id)
     if not customer:
         raise HTTPException(status_code=404, detail="Customer not found")
     customer.name = payload.name
@@ -55,7 +56,7 @@ def update_customer(customer_id: int, payload: CustomerCreate, db: Session = Dep
 
 @router.delete("/{customer_id}", status_code=204)
 def delete_customer(customer_id: int, db: Session = Depends(get_db)):
-    customer = db.query(Customer).filter(Customer.id == customer_id).first()
+    customer = db.get(Customer, customer_id)
     if not customer:
         raise HTTPException(status_code=404, detail="Customer not found")
     db.delete(customer)
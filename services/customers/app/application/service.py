@@ -1,4 +1,5 @@
 from sqlalchemy.orm import Session
+from typing import List, Optional
 from app.domain.models import Customer
 from .schemas import CustomerCreate
 
@@ -6,8 +7,11 @@ class CustomerService:
     def __init__(self, db: Session):
         self.db = db
 
-    def list(self):
-        return self.db.query(Customer).all()
+    def list(self, ids: Optional[List[int]] = None):
+        query = self.db.query(Customer)
+        if ids:
+            query = query.filter(Customer.id.in_(ids))
+        return query.all()
 
     def create(self, data: CustomerCreate):
         obj = Customer(
@@ -10,14 +10,21 @@ from typing import Dict, Optional, List
 from enum import Enum
 from io import StringIO
 import csv
+import gzip
+import hashlib
 import logging
 
 import httpx
 import jwt
+import msgpack
 try:
     import bcrypt  # optional; used if passwords are provided as bcrypt hashes
 except Exception:
     bcrypt = None
+try:
+    import brotli  # optional; enables br-encoded HTML pages
+except Exception:
+    brotli = None
 from fastapi import FastAPI, WebSocket, WebSocketDisconnect, HTTPException, Depends, status, Query, Request
 from fastapi.security import HTTPBasic, HTTPBasicCredentials
 from fastapi.responses import HTMLResponse, StreamingResponse, Response
@@ -85,11 +92,43 @@ def wait_for_database(max_retries=30, retry_delay=2):
     
     return False
 
+ACTIVITY_LOGS_DDL = """
+    CREATE TABLE IF NOT EXISTS activity_logs (
+        id SERIAL PRIMARY KEY,
+        timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        event_type VARCHAR(50) NOT NULL,
+        entity_type VARCHAR(50) NOT NULL,
+        entity_id VARCHAR(100),
+        user_id VARCHAR(100),
+        description TEXT,
+        metadata JSONB,
+        ip_address INET,
+        user_agent TEXT,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    );
+
+    CREATE INDEX IF NOT EXISTS idx_activity_logs_timestamp ON activity_logs(timestamp DESC);
+    CREATE INDEX IF NOT EXISTS idx_activity_logs_event_type ON activity_logs(event_type);
+    CREATE INDEX IF NOT EXISTS idx_activity_logs_entity_type ON activity_logs(entity_type);
+    CREATE INDEX IF NOT EXISTS idx_activity_logs_entity_id ON activity_logs(entity_id);
+    CREATE INDEX IF NOT EXISTS idx_activity_logs_user_id ON activity_logs(user_id);
+    CREATE INDEX IF NOT EXISTS idx_activity_logs_metadata ON activity_logs USING gin(metadata);
+
+    CREATE OR REPLACE VIEW recent_activity AS
+    SELECT * FROM activity_logs
+    WHERE timestamp >= NOW() - INTERVAL '7 days'
+    ORDER BY timestamp DESC;
+"""
+
 @app.on_event("startup")
 async def startup_event():
     """Run migrations and setup on application startup"""
     logger.info("Starting ECI Dashboard...")
     
+    # Read and compress HTML pages once
+    for page_name in ("dashboard.html", "logs.html"):
+        _load_page(page_name)
+    
     # Wait for database to be ready
     try:
         wait_for_database()
@@ -101,56 +140,9 @@ async def startup_event():
     try:
         logger.info("Running database migrations...")
         with engine.begin() as conn:
-            # Check if activity_logs table exists
-            result = conn.execute(text("""
-                SELECT EXISTS (
-                    SELECT FROM information_schema.tables 
-                    WHERE table_schema = 'public' 
-                    AND table_name = 'activity_logs'
-                );
-            """))
-            table_exists = result.scalar()
-            
-            if not table_exists:
-                logger.info("Creating activity_logs table...")
-                
-                # Create table
-                conn.execute(text("""
-                    CREATE TABLE activity_logs (
-                        id SERIAL PRIMARY KEY,
-                        timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                        event_type VARCHAR(50) NOT NULL,
-                        entity_type VARCHAR(50) NOT NULL,
-                        entity_id VARCHAR(100),
-                        user_id VARCHAR(100),
-                        description TEXT,
-                        metadata JSONB,
-                        ip_address INET,
-                        user_agent TEXT,
-                        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                    );
-                """))
-                
-                # Create indexes
-                conn.execute(text("CREATE INDEX IF NOT EXISTS idx_activity_logs_timestamp ON activity_logs(timestamp DESC);"))
-                conn.execute(text("CREATE INDEX IF NOT EXISTS idx_activity_logs_event_type ON activity_logs(event_type);"))
-                conn.execute(text("CREATE INDEX IF NOT EXISTS idx_activity_logs_entity_type ON activity_logs(entity_type);"))
-                conn.execute(text("CREATE INDEX IF NOT EXISTS idx_activity_logs_entity_id ON activity_logs(entity_id);"))
-                conn.execute(text("CREATE INDEX IF NOT EXISTS idx_activity_logs_user_id ON activity_logs(user_id);"))
-                conn.execute(text("CREATE INDEX IF NOT EXISTS idx_activity_logs_metadata ON activity_logs USING gin(metadata);"))
-                
-                # Create view
-                conn.execute(text("""
-                    CREATE OR REPLACE VIEW recent_activity AS
-                    SELECT * FROM activity_logs
-                    WHERE timestamp >= NOW() - INTERVAL '7 days'
-                    ORDER BY timestamp DESC;
-                """))
-                
-                # Transaction will be committed automatically on exit
-                logger.info("✓ activity_logs table created successfully")
-            else:
-                logger.info("✓ activity_logs table already exists")
+            # Idempotent DDL: table, indexes and view in a single round-trip
+            conn.execute(text(ACTIVITY_LOGS_DDL))
+            logger.info("✓ activity_logs table is in place")
         
         logger.info("✓ Database migrations completed")
     except Exception as e:
@@ -513,6 +505,33 @@ async def user_info(user: Dict = Depends(get_current_user)):
         "name": user["name"]
     }
 
+# Shared /ws broadcaster: one fetch + one encode per tick, fanned out to every client
+metrics_broadcaster: Optional[asyncio.Task] = None
+last_metrics_frame: Optional[bytes] = None
+
+async def broadcast_metrics():
+    """Push the same encoded metrics frame to all connected dashboards until none remain"""
+    global last_metrics_frame
+    while active_connections:
+        try:
+            metrics = await fetch_metrics(UserRole.GUEST)
+            frame = msgpack.packb(metrics, use_bin_type=True)
+            last_metrics_frame = frame
+            clients = list(active_connections)
+            results = await asyncio.gather(*(ws.send_bytes(frame) for ws in clients), return_exceptions=True)
+            for ws, result in zip(clients, results):
+                if isinstance(result, Exception):
+                    active_connections.pop(ws, None)
+        except Exception as e:
+            logger.error(f"Error broadcasting metrics: {e}")
+        await asyncio.sleep(POLL_INTERVAL_SEC)
+
+def ensure_metrics_broadcaster():
+    """Start the broadcaster task if it is not already running"""
+    global metrics_broadcaster
+    if metrics_broadcaster is None or metrics_broadcaster.done():
+        metrics_broadcaster = asyncio.create_task(broadcast_metrics())
+
 @app.websocket("/ws")
 async def websocket_endpoint(websocket: WebSocket):
     """WebSocket endpoint for real-time updates"""
@@ -523,13 +542,19 @@ async def websocket_endpoint(websocket: WebSocket):
     active_connections[websocket] = {"role": user_role}
 
     try:
+        # Give new clients the latest snapshot right away instead of waiting for the next tick
+        if last_metrics_frame is not None:
+            await websocket.send_bytes(last_metrics_frame)
+        ensure_metrics_broadcaster()
+        # Snapshots are pushed by the broadcaster; just wait for the client to go away
         while True:
-            # Send metrics every 2 seconds
-            metrics = await fetch_metrics(user_role)
-            await websocket.send_json(metrics)
-            await asyncio.sleep(POLL_INTERVAL_SEC)
+            message = await websocket.receive()
+            if message["type"] == "websocket.disconnect":
+                break
     except WebSocketDisconnect:
-        del active_connections[websocket]
+        pass
+    finally:
+        active_connections.pop(websocket, None)
 
 @app.websocket("/ws/logs")
 async def logs_websocket_endpoint(websocket: WebSocket):
@@ -1651,27 +1676,93 @@ async def get_shipments(user: Dict = Depends(get_current_user)):
 async def health_snapshot(user: Dict = Depends(get_current_user)):
     return await fetch_metrics(user_role=user.get("role", UserRole.GUEST))
 
-@app.get("/")
-async def dashboard():
-    """Serve the enhanced dashboard HTML"""
-    # Read the dashboard HTML template
-    template_path = os.path.join(os.path.dirname(__file__), 'templates', 'dashboard.html')
+TEMPLATES_DIR = os.path.join(os.path.dirname(__file__), 'templates')
+
+# Pre-read, pre-compressed HTML pages keyed by template name (None if missing)
+_PAGE_CACHE: Dict[str, Optional[Dict]] = {}
+
+def _load_page(name: str) -> Optional[Dict]:
+    """Read a template once and keep identity/gzip/br variants with per-variant strong ETags."""
+    if name in _PAGE_CACHE:
+        return _PAGE_CACHE[name]
     try:
-        with open(template_path, 'r') as f:
-            content = f.read()
-        return HTMLResponse(content=content, headers={"Cache-Control": "no-store"})
+        with open(os.path.join(TEMPLATES_DIR, name), 'rb') as f:
+            raw = f.read()
     except FileNotFoundError:
+        _PAGE_CACHE[name] = None
+        return None
+    page = {
+        "identity": raw,
+        "gzip": gzip.compress(raw, compresslevel=9),
+        "br": brotli.compress(raw, quality=11) if brotli else None,
+    }
+    # Each encoding is a different byte sequence, so each needs its own strong validator;
+    # otherwise a shared cache could answer an identity revalidation with a brotli body
+    digest = hashlib.sha256(raw).hexdigest()
+    page["etags"] = {
+        "identity": f'"{digest}"',
+        "gzip": f'"{digest}-gzip"',
+        "br": f'"{digest}-br"',
+    }
+    _PAGE_CACHE[name] = page
+    return page
+
+def _pick_encoding(accept_encoding: str, has_br: bool) -> str:
+    """Best of br/gzip/identity by Accept-Encoding q-values (q=0 refuses; ties prefer smaller)."""
+    qvalues: Dict[str, float] = {}
+    for part in accept_encoding.split(","):
+        coding, _, params = part.strip().partition(";")
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        q = 1.0
+        for param in params.split(";"):
+            key, _, value = param.strip().partition("=")
+            if key.strip().lower() == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        qvalues[coding] = q
+    wildcard = qvalues.get("*", 0.0)
+    candidates = ["br", "gzip"] if has_br else ["gzip"]
+    best, best_q = "identity", 0.0
+    for coding in candidates:
+        q = qvalues.get(coding, wildcard)
+        if q > best_q:
+            best, best_q = coding, q
+    if best != "identity" and qvalues.get("identity", 1.0) > best_q:
+        return "identity"
+    return best
+
+def _serve_page(request: Request, page: Dict) -> Response:
+    """Serve a cached page, answering 304 on a matching ETag and picking the best encoding."""
+    encoding = _pick_encoding(request.headers.get("accept-encoding", ""), page["br"] is not None)
+    etag = page["etags"][encoding]
+    # Pages live at unversioned URLs, so browsers revalidate (cheap 304) instead of caching forever
+    headers = {"Cache-Control": "no-cache", "ETag": etag, "Vary": "Accept-Encoding"}
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match and etag in (t.strip() for t in if_none_match.split(",")):
+        return Response(status_code=304, headers=headers)
+    if encoding != "identity":
+        headers["Content-Encoding"] = encoding
+    return Response(content=page[encoding], media_type="text/html; charset=utf-8", headers=headers)
+
+@app.get("/")
+async def dashboard(request: Request):
+    """Serve the enhanced dashboard HTML"""
+    page = _load_page('dashboard.html')
+    if page is None:
         return HTMLResponse(content="<h1>Dashboard template not found</h1>", status_code=404, headers={"Cache-Control": "no-store"})
+    return _serve_page(request, page)
 
 @app.get("/logs")
-async def logs_page():
+async def logs_page(request: Request):
     """Serve the activity logs HTML page"""
-    template_path = os.path.join(os.path.dirname(__file__), 'templates', 'logs.html')
-    try:
-        with open(template_path, 'r') as f:
-            content = f.read()
-        return HTMLResponse(content=content, headers={"Cache-Control": "no-store"})
-    except FileNotFoundError:
+    page = _load_page('logs.html')
+    if page is not None:
+        return _serve_page(request, page)
+    else:
         # Fallback to inline HTML if template not found
         return HTMLResponse(content="""
 <!DOCTYPE html>
@@ -2002,6 +2093,7 @@ async def logs_page():
             text-align: center;
         }
     </style>
+    <script src="https://cdn.jsdelivr.net/npm/msgpack-lite@0.1.26/dist/msgpack.min.js"></script>
 </head>
 <body>
     <!-- Login Screen -->
@@ -2083,6 +2175,7 @@ async def logs_page():
         let ws = null;
         let authCredentials = null;
         let currentUser = null;
+        const inFlight = new Set(); // action keys with a request in progress
 
         // Login functionality
         document.getElementById('loginForm').addEventListener('submit', async (e) => {
@@ -2149,9 +2242,10 @@ async def logs_page():
         function connectWebSocket() {
             const protocol = window.location.protocol === 'https:' ? 'wss:' : 'ws:';
             ws = new WebSocket(`${protocol}//${window.location.host}/ws`);
+            ws.binaryType = 'arraybuffer';
 
             ws.onmessage = (event) => {
-                const data = JSON.parse(event.data);
+                const data = msgpack.decode(new Uint8Array(event.data));
                 updateDashboard(data);
             };
 
@@ -2173,9 +2267,9 @@ async def logs_page():
                 `${data.totals.inventory_reserve_latency_ms || 0}<span style="font-size: 1rem;">ms</span>`;
             document.getElementById('stockouts').textContent = data.totals.stockouts_total || 0;
 
-            // Update services
+            // Update services (build off-DOM, then swap in with a single mutation)
             const servicesGrid = document.getElementById('servicesGrid');
-            servicesGrid.innerHTML = '';
+            const fragment = document.createDocumentFragment();
 
             for (const [name, info] of Object.entries(data.services)) {
                 const card = document.createElement('div');
@@ -2194,8 +2288,9 @@ async def logs_page():
                         ${info.response_time_ms !== undefined ? info.response_time_ms + 'ms' : info.error || 'N/A'}
                     </div>
                 `;
-                servicesGrid.appendChild(card);
+                fragment.appendChild(card);
             }
+            servicesGrid.replaceChildren(fragment);
 
             // Update timestamp
             const date = new Date(data.timestamp);
@@ -2208,7 +2303,11 @@ async def logs_page():
                 showMessage('Only administrators can create orders', 'error');
                 return;
             }
+            if (inFlight.has('create')) return;
 
+            const createOrderBtn = document.getElementById('createOrderBtn');
+            inFlight.add('create');
+            createOrderBtn.disabled = true;
             try {
                 const response = await fetch('/api/create_order', {
                     method: 'POST',
@@ -2237,6 +2336,9 @@ async def logs_page():
                 }
             } catch (error) {
                 showMessage('Error creating order: ' + error.message, 'error');
+            } finally {
+                inFlight.delete('create');
+                createOrderBtn.disabled = currentUser === null || currentUser.role === 'guest';
             }
         }
 
@@ -2260,7 +2362,11 @@ async def logs_page():
                 showMessage('Only administrators can reset metrics', 'error');
                 return;
             }
+            if (inFlight.has('reset')) return;
 
+            const resetMetricsBtn = document.getElementById('resetMetricsBtn');
+            inFlight.add('reset');
+            resetMetricsBtn.disabled = true;
             try {
                 const response = await fetch('/api/reset_metrics', {
                     method: 'POST',
@@ -2273,6 +2379,9 @@ async def logs_page():
                 showMessage(result.message, 'success');
             } catch (error) {
                 showMessage('Error resetting metrics', 'error');
+            } finally {
+                inFlight.delete('reset');
+                resetMetricsBtn.disabled = currentUser === null || currentUser.role === 'guest';
             }
         }
 
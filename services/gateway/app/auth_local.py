@@ -5,13 +5,18 @@ from .core_settings import get_settings
 
 settings = get_settings()
 
+# Encoded once so PyJWT doesn't re-encode the HMAC key on every mint/verify
+_SECRET_BYTES = settings.JWT_SECRET.encode("utf-8")
+_ALGORITHMS = [settings.JWT_ALG]
+_UTC = timezone.utc
+
 def create_access_token(subject: str, expires_minutes: int = 60) -> str:
-    now = datetime.now(timezone.utc)
+    now = datetime.now(_UTC)
     payload = {"sub": subject, "iat": now, "exp": now + timedelta(minutes=expires_minutes)}
-    return jwt.encode(payload, settings.JWT_SECRET, algorithm=settings.JWT_ALG)
+    return jwt.encode(payload, _SECRET_BYTES, algorithm=settings.JWT_ALG)
 
 def decode_access_token(token: str) -> Optional[dict]:
     try:
-        return jwt.decode(token, settings.JWT_SECRET, algorithms=[settings.JWT_ALG])
+        return jwt.decode(token, _SECRET_BYTES, algorithms=_ALGORITHMS)
     except jwt.PyJWTError:
         return None
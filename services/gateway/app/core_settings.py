@@ -9,6 +9,9 @@ class Settings(BaseSettings):
     POSTGRES_PASSWORD: str = "eci"
     JWT_SECRET: str = "change-me"
     JWT_ALG: str = "HS256"
+    # Safety-net TTL for gateway cache entries; gateway writes already invalidate precisely via
+    # version bumps, so raise this when no client writes to the services around the gateway
+    CACHE_TTL_SECONDS: int = 60
 
     class Config:
         env_file = ".env"
@@ -0,0 +1,13 @@
+from alembic import op
+
+revision = '0003_product_warehouse_index'
+down_revision = '0002_add_fk_product_id'
+branch_labels = None
+depends_on = None
+
+def upgrade():
+    # Natural lookup key for stock rows
+    op.create_index('ix_inventory_product_warehouse', 'inventory', ['product_id', 'warehouse'])
+
+def downgrade():
+    op.drop_index('ix_inventory_product_warehouse', table_name='inventory')
@@ -1,4 +1,5 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Response
+from pydantic import TypeAdapter
 from sqlalchemy.orm import Session
 from app.infrastructure.db import get_db
 from app.application.service import InventoryService
@@ -7,9 +8,13 @@ from app.domain.models import Inventory
 
 router = APIRouter(prefix="/inventory", tags=["inventory"])
 
+# Validates/serializes the whole list in one pydantic-core call
+_inventory_list = TypeAdapter(list[InventoryRead])
+
 @router.get("/", response_model=list[InventoryRead])
 def list_inventory(db: Session = Depends(get_db)):
-    return InventoryService(db).list()
+    rows = _inventory_list.validate_python(InventoryService(db).list())
+    return Response(content=_inventory_list.dump_json(rows), media_type="application/json")
 
 @router.post("/", response_model=InventoryRead, status_code=201)
 def create_inventory(payload: InventoryCreate, db: Session = Depends(get_db)):
@@ -17,7 +22,7 @@ def create_inventory(payload: InventoryCreate, db: Session = Depends(get_db)):
 
 @router.put("/{inventory_id}", response_model=InventoryRead)
 def update_inventory(inventory_id: int, payload: InventoryCreate, db: Session = Depends(get_db)):
-    inventory = db.query(Inventory).filter(Inventory.id == inventory_id).first()
+    inventory = db.get(Inventory, inventory_id)
     if not inventory:
         raise HTTPException(status_code=404, detail="Inventory not found")
     inventory.product_id = payload.product_id
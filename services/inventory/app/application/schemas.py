@@ -1,4 +1,4 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
 
 class InventoryCreate(BaseModel):
     product_id: int
@@ -12,5 +12,4 @@ class InventoryRead(BaseModel):
     warehouse: str
     on_hand: int
     reserved: int
-    class Config:
-        orm_mode = True
+    model_config = ConfigDict(from_attributes=True)
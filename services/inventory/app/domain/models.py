@@ -1,5 +1,5 @@
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column
-from sqlalchemy import String, Integer, ForeignKey
+from sqlalchemy import String, Integer, ForeignKey, Index
 
 class Base(DeclarativeBase):
     pass
@@ -12,3 +12,4 @@ class Inventory(Base):
     warehouse: Mapped[str] = mapped_column(String(50))
     on_hand: Mapped[int] = mapped_column(Integer)
     reserved: Mapped[int] = mapped_column(Integer, default=0)
+    __table_args__ = (Index("ix_inventory_product_warehouse", "product_id", "warehouse"),)
@@ -0,0 +1,28 @@
+"""list_indexes
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2025-01-20
+
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = '0005'
+down_revision = '0004'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Predicates used by the filtered /orders/ list endpoint
+    op.create_index('ix_orders_customer_status', 'orders', ['customer_id', 'order_status'])
+    op.create_index('ix_orders_payment_status', 'orders', ['payment_status'])
+    # Postgres does not index FK columns; selectinload(Order.items) looks items up by order_id
+    op.create_index('ix_order_items_order_id', 'order_items', ['order_id'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_order_items_order_id', table_name='order_items')
+    op.drop_index('ix_orders_payment_status', table_name='orders')
+    op.drop_index('ix_orders_customer_status', table_name='orders')
@@ -0,0 +1,30 @@
+"""order_number_seq
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2025-01-22
+
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = '0006'
+down_revision = '0005'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute("CREATE SEQUENCE IF NOT EXISTS orders_ord_seq")
+    # Continue after the highest number already issued so new order numbers stay unique
+    op.execute(r"""
+        SELECT setval('orders_ord_seq',
+                      COALESCE(MAX(CAST(split_part(order_number, '-', 3) AS BIGINT)), 0) + 1,
+                      false)
+        FROM orders
+        WHERE order_number ~ '^ORD-\d{4}-\d+$'
+    """)
+
+
+def downgrade() -> None:
+    op.execute("DROP SEQUENCE IF EXISTS orders_ord_seq")
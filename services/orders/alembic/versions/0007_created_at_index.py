@@ -0,0 +1,23 @@
+"""created_at_index
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2025-01-23
+
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = '0007'
+down_revision = '0006'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Backs order_by=created_at / -created_at on the list endpoint (btree scans both ways)
+    op.create_index('ix_orders_created_at', 'orders', ['created_at'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_orders_created_at', table_name='orders')
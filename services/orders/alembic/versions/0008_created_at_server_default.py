@@ -0,0 +1,24 @@
+"""created_at_server_default
+
+Revision ID: 0008
+Revises: 0007
+Create Date: 2025-01-24
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '0008'
+down_revision = '0007'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Naive UTC, matching what datetime.utcnow used to send from the app
+    op.alter_column('orders', 'created_at', server_default=sa.text("(now() AT TIME ZONE 'utc')"))
+
+
+def downgrade() -> None:
+    op.alter_column('orders', 'created_at', server_default=None)
@@ -1,16 +1,52 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from fastapi.responses import StreamingResponse
+from pydantic import TypeAdapter
 from sqlalchemy.orm import Session
-from app.infrastructure.db import get_db
+from typing import Optional
+from app.infrastructure.db import get_db, SessionLocal
 from app.application.service import OrderService
 from app.application.schemas import OrderCreate, OrderRead, OrderUpdate
 from app.domain.models import Order
 
 router = APIRouter(prefix="/orders", tags=["orders"])
 
+# Validates/serializes the whole list in one pydantic-core call
+_order_list = TypeAdapter(list[OrderRead])
+_order = TypeAdapter(OrderRead)
+
 @router.get("/", response_model=list[OrderRead])
-def list_orders(db: Session = Depends(get_db)):
-    """List all orders (fast, without metadata enrichment)."""
-    return OrderService(db).list()
+def list_orders(
+    db: Session = Depends(get_db),
+    ids: Optional[str] = Query(None, pattern=r"^\d+(,\d+)*$", description="Comma-separated ids to fetch in one call"),
+    customer_id: Optional[int] = None,
+    order_status: Optional[str] = None,
+    payment_status: Optional[str] = None,
+    min_total: Optional[float] = None,
+    max_total: Optional[float] = None,
+    order_by: Optional[str] = Query(None, pattern=r"^-?\w+(,-?\w+)*$", description="Comma-separated columns, '-' prefix for descending"),
+    skip: int = Query(0, ge=0, description="Number of records to skip"),
+    limit: Optional[int] = Query(None, ge=0, description="Maximum number of records to return (all when omitted)"),
+):
+    """List orders (fast, without metadata enrichment); filtering, ordering and paging run in SQL."""
+    try:
+        orders = OrderService(db).list(
+            [int(i) for i in ids.split(",")] if ids else None,
+            customer_id=customer_id, order_status=order_status, payment_status=payment_status,
+            min_total=min_total, max_total=max_total, order_by=order_by.split(",") if order_by else None, skip=skip, limit=limit,
+        )
+    except ValueError as exc:
+        raise HTTPException(status_code=422, detail=str(exc))
+    return Response(content=_order_list.dump_json(_order_list.validate_python(orders)), media_type="application/json")
+
+@router.get("/stream")
+def stream_orders_with_metadata():
+    """Stream all orders with metadata enrichment as NDJSON, one order per line."""
+    def generate():
+        # Own session: dependency teardown runs before a streaming body is consumed
+        with SessionLocal() as db:
+            for order in OrderService(db).iter_with_metadata():
+                yield _order.dump_json(_order.validate_python(order)) + b"\n"
+    return StreamingResponse(generate(), media_type="application/x-ndjson")
 
 @router.get("/{order_id}", response_model=OrderRead)
 def get_order(order_id: int, db: Session = Depends(get_db)):
@@ -26,7 +62,7 @@ def create_order(payload: OrderCreate, db: Session = Depends(get_db)):
 
 @router.put("/{order_id}", response_model=OrderRead)
 def update_order(order_id: int, payload: OrderUpdate, db: Session = Depends(get_db)):
-    order = db.query(Order).filter(Order.id == order_id).first()
+    order = db.get(Order, order_id)
     if not order:
         raise HTTPException(status_code=404, detail="Order not found")
     
@@ -48,7 +84,7 @@ def update_order(order_id: int, payload: OrderUpdate, db: Session = Depends(get_
 
 @router.delete("/{order_id}", status_code=204)
 def delete_order(order_id: int, db: Session = Depends(get_db)):
-    order = db.query(Order).filter(Order.id == order_id).first()
+    order = db.get(Order, order_id)
     if not order:
         raise HTTPException(status_code=404, detail="Order not found")
     
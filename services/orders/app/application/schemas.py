@@ -1,4 +1,4 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
 from datetime import datetime
 from typing import Optional
 
@@ -32,8 +32,7 @@ class OrderItemRead(BaseModel):
     product_data_status: Optional[str] = None  # "current", "modified", "deleted"
     product_current_name: Optional[str] = None
     product_current_price: Optional[float] = None
-    class Config:
-        orm_mode = True
+    model_config = ConfigDict(from_attributes=True)
 
 class OrderRead(BaseModel):
     id: int
@@ -53,5 +52,4 @@ class OrderRead(BaseModel):
     customer_data_status: Optional[str] = None  # "current", "modified", "deleted"
     customer_current_name: Optional[str] = None
     customer_current_email: Optional[str] = None
-    class Config:
-        orm_mode = True
+    model_config = ConfigDict(from_attributes=True)
@@ -1,13 +1,83 @@
-from sqlalchemy.orm import Session
+from sqlalchemy import select, text
+from sqlalchemy.orm import Session, selectinload
 from app.domain.models import Order, OrderItem
 from .schemas import OrderCreate, OrderUpdate, OrderRead, OrderItemRead
+from shared.core import order_clauses
 from datetime import datetime
+from decimal import Decimal
 import random
 import httpx
 import os
+import pybreaker
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from cachetools import TTLCache
 from typing import Optional, List
 
+# Shared across OrderService instances so keep-alive connections to customers/products
+# survive between requests; closed from the app lifespan
+_HTTP = httpx.Client(
+    # Short timeouts bound how long enrichment waits on a struggling downstream
+    timeout=httpx.Timeout(1.5, connect=0.5),
+    limits=httpx.Limits(max_keepalive_connections=20, max_connections=100),
+    transport=httpx.HTTPTransport(retries=1),
+)
+
+BULK_FETCH_SIZE = 1000
+
+# Runs the customers lookup alongside the products lookup during enrichment
+_FETCH_POOL = ThreadPoolExecutor(max_workers=20, thread_name_prefix="orders-fetch")
+
+def close_http_client() -> None:
+    _FETCH_POOL.shutdown(wait=False)
+    _HTTP.close()
+
+# Current customer/product records by id, shared by every OrderService in the process.
+# Only found records are cached so new or transiently unreachable ids are retried.
+# Customers/products are written by other services, so entries are never evicted from
+# here; edits show up once the 30s TTL lapses.
+_CUSTOMER_CACHE = TTLCache(maxsize=10_000, ttl=30)
+_PRODUCT_CACHE = TTLCache(maxsize=10_000, ttl=30)
+_CACHE_LOCK = threading.Lock()
+
+# Per-downstream breakers: after 5 consecutive failures (errors/5xx) calls fail fast for 30s
+# and lookups degrade to "no data" instead of each waiting out a timeout
+_CUSTOMERS_BREAKER = pybreaker.CircuitBreaker(fail_max=5, reset_timeout=30, name="customers")
+_PRODUCTS_BREAKER = pybreaker.CircuitBreaker(fail_max=5, reset_timeout=30, name="products")
+
+def _checked_get(url: str, params: Optional[dict]) -> httpx.Response:
+    response = _HTTP.get(url, params=params)
+    if response.status_code >= 500:
+        response.raise_for_status()
+    return response
+
+def _guarded_get(breaker: pybreaker.CircuitBreaker, url: str, params: Optional[dict] = None) -> Optional[httpx.Response]:
+    """GET through the downstream's breaker; None on failure or while the breaker is open."""
+    try:
+        return breaker.call(_checked_get, url, params)
+    except Exception:
+        return None
+
+# Columns copied verbatim into the enriched order/item dicts
+_ORDER_FIELDS = (
+    "id", "order_number", "customer_id", "order_status", "payment_status", "order_total",
+    "payment_id", "receipt_id", "created_at",
+    "customer_name_snapshot", "customer_email_snapshot", "customer_phone_snapshot",
+)
+_ITEM_FIELDS = (
+    "id", "product_id", "sku", "quantity", "unit_price",
+    "product_name_snapshot", "product_category_snapshot",
+)
+
+def _data_status(current: Optional[tuple], snapshot: tuple) -> str:
+    """Return "deleted" when the record is gone, "modified" when any compared field differs, else "current"."""
+    if current is None:
+        return "deleted"
+    return "current" if current == snapshot else "modified"
+
 class OrderService:
+    SORTABLE = {"id", "customer_id", "order_status", "payment_status", "order_total", "created_at"}
+
     def __init__(self, db: Session):
         self.db = db
         # Service URLs from environment or defaults
@@ -17,40 +87,81 @@ class OrderService:
     def _generate_order_number(self) -> str:
         """Generate a realistic order number in format ORD-YYYY-NNNNN"""
         year = datetime.now().year
-        # Get count of orders this year for sequential numbering
-        count = self.db.query(Order).filter(
-            Order.order_number.like(f"ORD-{year}-%")
-        ).count()
-        return f"ORD-{year}-{(count + 1):05d}"
-
-    def list(self):
-        return self.db.query(Order).all()
+        # nextval is O(1) and never hands the same number to two concurrent creates
+        n = self.db.execute(text("SELECT nextval('orders_ord_seq')")).scalar()
+        return f"ORD-{year}-{n:05d}"
+
+    def list(self, ids: Optional[List[int]] = None, customer_id: Optional[int] = None,
+             order_status: Optional[str] = None, payment_status: Optional[str] = None,
+             min_total: Optional[float] = None, max_total: Optional[float] = None,
+             order_by: Optional[List[str]] = None, skip: int = 0, limit: Optional[int] = None):
+        # Items for every returned order come back in one SELECT ... WHERE order_id IN (...)
+        query = self.db.query(Order).options(selectinload(Order.items))
+        if ids:
+            query = query.filter(Order.id.in_(ids))
+        if customer_id is not None:
+            query = query.filter(Order.customer_id == customer_id)
+        if order_status is not None:
+            query = query.filter(Order.order_status == order_status)
+        if payment_status is not None:
+            query = query.filter(Order.payment_status == payment_status)
+        if min_total is not None:
+            query = query.filter(Order.order_total >= min_total)
+        if max_total is not None:
+            query = query.filter(Order.order_total <= max_total)
+        if order_by:
+            query = query.order_by(*order_clauses(Order, order_by, self.SORTABLE))
+        return query.offset(skip).limit(limit).all()
     
     def get(self, order_id: int):
-        return self.db.query(Order).filter(Order.id == order_id).first()
+        # Identity-map hit skips the query; same loader as list() otherwise
+        return self.db.get(Order, order_id, options=[selectinload(Order.items)])
 
     def _fetch_customer(self, customer_id: int) -> Optional[dict]:
         """Fetch customer data from customer service."""
-        try:
-            with httpx.Client(timeout=5.0) as client:
-                response = client.get(f"{self.customers_url}/customers/{customer_id}")
-                if response.status_code == 200:
-                    return response.json()
-        except Exception:
-            pass
-        return None
+        return self._fetch_one(f"{self.customers_url}/customers/{customer_id}", customer_id,
+                               _CUSTOMER_CACHE, _CUSTOMERS_BREAKER)
     
     def _fetch_product(self, product_id: int) -> Optional[dict]:
         """Fetch product data from product service."""
-        try:
-            with httpx.Client(timeout=5.0) as client:
-                response = client.get(f"{self.products_url}/products/{product_id}")
-                if response.status_code == 200:
-                    return response.json()
-        except Exception:
-            pass
+        return self._fetch_one(f"{self.products_url}/products/{product_id}", product_id,
+                               _PRODUCT_CACHE, _PRODUCTS_BREAKER)
+
+    def _fetch_one(self, url: str, key: int, cache: TTLCache, breaker: pybreaker.CircuitBreaker) -> Optional[dict]:
+        with _CACHE_LOCK:
+            cached = cache.get(key)
+        if cached is not None:
+            return cached
+        response = _guarded_get(breaker, url)
+        if response is not None and response.status_code == 200:
+            data = response.json()
+            with _CACHE_LOCK:
+                cache[key] = data
+            return data
         return None
 
+    def _fetch_bulk(self, url: str, ids: set, cache: TTLCache, breaker: pybreaker.CircuitBreaker) -> dict:
+        """Fetch many records via the list endpoint's ?ids= filter, keyed by id."""
+        with _CACHE_LOCK:
+            found = {i: row for i in ids if (row := cache.get(i)) is not None}
+        ids = sorted(ids - found.keys())
+        # Upstream list endpoints cap limit at 1000
+        for start in range(0, len(ids), BULK_FETCH_SIZE):
+            chunk = ids[start:start + BULK_FETCH_SIZE]
+            response = _guarded_get(breaker, url, {"ids": ",".join(map(str, chunk)), "limit": len(chunk)})
+            if response is not None and response.status_code == 200:
+                fetched = {row["id"]: row for row in response.json()}
+                with _CACHE_LOCK:
+                    cache.update(fetched)
+                found.update(fetched)
+        return found
+
+    def _fetch_customers_bulk(self, ids: set) -> dict:
+        return self._fetch_bulk(f"{self.customers_url}/customers/", ids, _CUSTOMER_CACHE, _CUSTOMERS_BREAKER)
+
+    def _fetch_products_bulk(self, ids: set) -> dict:
+        return self._fetch_bulk(f"{self.products_url}/products/", ids, _PRODUCT_CACHE, _PRODUCTS_BREAKER)
+
     def create(self, data: OrderCreate):
         total = sum(i.quantity * i.unit_price for i in data.items)
         order_number = self._generate_order_number()
@@ -69,15 +180,13 @@ class OrderService:
             customer_email_snapshot=customer_data.get('email') if customer_data else None,
             customer_phone_snapshot=customer_data.get('phone') if customer_data else None
         )
-        self.db.add(order)
-        self.db.flush()  # assign id
-        
+        # Fetch product snapshot data for every line in one call
+        products = self._fetch_products_bulk({item.product_id for item in data.items})
+        items = []
         for item in data.items:
-            # Fetch product snapshot data
-            product_data = self._fetch_product(item.product_id)
+            product_data = products.get(item.product_id)
             
-            oi = OrderItem(
-                order_id=order.id,
+            items.append(OrderItem(
                 product_id=item.product_id,
                 sku=item.sku,
                 quantity=item.quantity,
@@ -85,76 +194,45 @@ class OrderService:
                 # Store product snapshot
                 product_name_snapshot=product_data.get('name') if product_data else None,
                 product_category_snapshot=product_data.get('category') if product_data else None
-            )
-            self.db.add(oi)
+            ))
         
+        # Items ride the relationship: one flush inserts the order, then all items as a
+        # single multi-row INSERT (insertmanyvalues) with order_id filled in
+        order.items = items
+        self.db.add(order)
         self.db.commit()
         self.db.refresh(order)
         return order
     
-    def _enrich_order_with_metadata(self, order: Order) -> dict:
-        """Enrich order with metadata showing if customer/product data has changed."""
-        order_dict = {
-            "id": order.id,
-            "order_number": order.order_number,
-            "customer_id": order.customer_id,
-            "order_status": order.order_status,
-            "payment_status": order.payment_status,
-            "order_total": float(order.order_total),
-            "payment_id": order.payment_id,
-            "receipt_id": order.receipt_id,
-            "created_at": order.created_at,
-            "customer_name_snapshot": order.customer_name_snapshot,
-            "customer_email_snapshot": order.customer_email_snapshot,
-            "customer_phone_snapshot": order.customer_phone_snapshot,
-            "items": []
-        }
-        
+    def _enrich_order_with_metadata(self, order: Order, customers: dict, products: dict) -> dict:
+        """Enrich order with metadata showing if customer/product data has changed.
+
+        customers/products are the current records keyed by id; a missing id means deleted.
+        """
+        # Decimals go straight to OrderRead, which coerces them once at serialization
+        order_dict = {f: getattr(order, f) for f in _ORDER_FIELDS}
+
         # Check customer data status
-        current_customer = self._fetch_customer(order.customer_id)
-        if current_customer is None:
-            order_dict["customer_data_status"] = "deleted"
-            order_dict["customer_current_name"] = None
-            order_dict["customer_current_email"] = None
-        elif (current_customer.get('name') != order.customer_name_snapshot or 
-              current_customer.get('email') != order.customer_email_snapshot):
-            order_dict["customer_data_status"] = "modified"
-            order_dict["customer_current_name"] = current_customer.get('name')
-            order_dict["customer_current_email"] = current_customer.get('email')
-        else:
-            order_dict["customer_data_status"] = "current"
-            order_dict["customer_current_name"] = current_customer.get('name')
-            order_dict["customer_current_email"] = current_customer.get('email')
-        
+        customer = customers.get(order.customer_id)
+        current = (customer.get('name'), customer.get('email')) if customer is not None else None
+        order_dict["customer_data_status"] = _data_status(
+            current, (order.customer_name_snapshot, order.customer_email_snapshot))
+        order_dict["customer_current_name"], order_dict["customer_current_email"] = current or (None, None)
+
         # Check product data for each item
+        items = order_dict["items"] = []
         for item in order.items:
-            item_dict = {
-                "id": item.id,
-                "product_id": item.product_id,
-                "sku": item.sku,
-                "quantity": item.quantity,
-                "unit_price": float(item.unit_price),
-                "product_name_snapshot": item.product_name_snapshot,
-                "product_category_snapshot": item.product_category_snapshot
-            }
-            
-            current_product = self._fetch_product(item.product_id)
-            if current_product is None:
-                item_dict["product_data_status"] = "deleted"
-                item_dict["product_current_name"] = None
-                item_dict["product_current_price"] = None
-            elif (current_product.get('name') != item.product_name_snapshot or
-                  float(current_product.get('price', 0)) != float(item.unit_price)):
-                item_dict["product_data_status"] = "modified"
-                item_dict["product_current_name"] = current_product.get('name')
-                item_dict["product_current_price"] = float(current_product.get('price', 0))
-            else:
-                item_dict["product_data_status"] = "current"
-                item_dict["product_current_name"] = current_product.get('name')
-                item_dict["product_current_price"] = float(current_product.get('price', 0))
-            
-            order_dict["items"].append(item_dict)
-        
+            item_dict = {f: getattr(item, f) for f in _ITEM_FIELDS}
+            product = products.get(item.product_id)
+            # Compare exactly against the Numeric(10,2) unit_price; str() keeps 79.99 from
+            # becoming 79.9899999... on the way into Decimal
+            current = ((product.get('name'), Decimal(str(product.get('price', 0))))
+                       if product is not None else None)
+            item_dict["product_data_status"] = _data_status(
+                current, (item.product_name_snapshot, item.unit_price))
+            item_dict["product_current_name"], item_dict["product_current_price"] = current or (None, None)
+            items.append(item_dict)
+
         return order_dict
 
     def get_with_metadata(self, order_id: int) -> Optional[dict]:
@@ -162,12 +240,26 @@ class OrderService:
         order = self.get(order_id)
         if not order:
             return None
-        return self._enrich_order_with_metadata(order)
+        return self._enrich_orders_with_metadata([order])[0]
     
     def list_with_metadata(self) -> List[dict]:
         """List all orders with enriched metadata."""
-        orders = self.list()
-        return [self._enrich_order_with_metadata(order) for order in orders]
+        return self._enrich_orders_with_metadata(self.list())
+
+    def iter_with_metadata(self, batch_size: int = 500):
+        """Yield every order enriched with metadata, holding at most one batch in memory."""
+        stmt = (select(Order).options(selectinload(Order.items)).order_by(Order.id)
+                .execution_options(yield_per=batch_size))
+        for batch in self.db.execute(stmt).scalars().partitions():
+            yield from self._enrich_orders_with_metadata(batch)
+
+    def _enrich_orders_with_metadata(self, orders: List[Order]) -> List[dict]:
+        # One customers call and one products call for the whole batch instead of 1+K per order,
+        # issued concurrently so enrichment costs about one round trip
+        customers = _FETCH_POOL.submit(self._fetch_customers_bulk, {o.customer_id for o in orders})
+        products = self._fetch_products_bulk({i.product_id for o in orders for i in o.items})
+        customers = customers.result()
+        return [self._enrich_order_with_metadata(o, customers, products) for o in orders]
 
     def update(self, order_id: int, data: OrderUpdate):
         order = self.get(order_id)
@@ -7,6 +7,11 @@ class Settings(BaseSettings):
     POSTGRES_DB: str = "eci"
     POSTGRES_USER: str = "eci"
     POSTGRES_PASSWORD: str = "eci"
+    # Connection pool; tune per environment via env vars
+    POOL_SIZE: int = 20
+    MAX_OVERFLOW: int = 10
+    POOL_TIMEOUT: int = 30
+    POOL_RECYCLE: int = 1800
 
     class Config:
         env_file = ".env"
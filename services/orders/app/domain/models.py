@@ -1,11 +1,14 @@
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column, relationship
-from sqlalchemy import String, ForeignKey, Numeric, DateTime
+from sqlalchemy import String, ForeignKey, Numeric, DateTime, Index, Sequence, text
 from datetime import datetime
 from typing import Optional
 
 class Base(DeclarativeBase):
     pass
 
+# Feeds the NNNNN part of order_number (see migration 0006)
+ORDER_NUMBER_SEQ = Sequence("orders_ord_seq", metadata=Base.metadata)
+
 class Order(Base):
     __tablename__ = "orders"
     id: Mapped[int] = mapped_column(primary_key=True)
@@ -17,17 +20,25 @@ class Order(Base):
     order_total: Mapped[float] = mapped_column(Numeric(10,2))
     payment_id: Mapped[Optional[str]] = mapped_column(String(100), nullable=True)
     receipt_id: Mapped[Optional[str]] = mapped_column(String(100), nullable=True)
-    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+    # Stamped by Postgres (naive UTC) and returned via INSERT ... RETURNING
+    created_at: Mapped[datetime] = mapped_column(DateTime, server_default=text("(now() AT TIME ZONE 'utc')"))
     # Customer snapshot data (captured at order creation time)
     customer_name_snapshot: Mapped[Optional[str]] = mapped_column(String(200), nullable=True)
     customer_email_snapshot: Mapped[Optional[str]] = mapped_column(String(255), nullable=True)
     customer_phone_snapshot: Mapped[Optional[str]] = mapped_column(String(50), nullable=True)
+    # Lazy by default: queries that touch items must ask for selectinload(Order.items),
+    # otherwise every order lazy-loads its items with its own SELECT (N+1)
     items: Mapped[list["OrderItem"]] = relationship("OrderItem", back_populates="order", cascade="all, delete-orphan")
+    __table_args__ = (
+        Index("ix_orders_customer_status", "customer_id", "order_status"),
+        Index("ix_orders_payment_status", "payment_status"),
+        Index("ix_orders_created_at", "created_at"),
+    )
 
 class OrderItem(Base):
     __tablename__ = "order_items"
     id: Mapped[int] = mapped_column(primary_key=True)
-    order_id: Mapped[int] = mapped_column(ForeignKey("orders.id"))
+    order_id: Mapped[int] = mapped_column(ForeignKey("orders.id"), index=True)
     # Store product_id as integer (no FK - microservices pattern)
     product_id: Mapped[int]
     sku: Mapped[str] = mapped_column(String(50))
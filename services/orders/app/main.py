@@ -4,9 +4,11 @@ Industry-standard implementation with comprehensive monitoring and logging
 """
 
 from fastapi import FastAPI
+from fastapi.responses import ORJSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 from contextlib import asynccontextmanager
-import subprocess
+from alembic import command
+from alembic.config import Config
 import os
 import sys
 import logging
@@ -17,6 +19,7 @@ sys.path.insert(0, os.path.join(os.path.dirname(__file__), "../../"))
 from shared.core import ServiceHealth, setup_logging, RequestLoggingMiddleware, get_logger
 from app.api.routes import router as orders_router
 from app.infrastructure.db import init_models
+from app.application.service import close_http_client
 
 # Service configuration
 SERVICE_NAME = "orders-service"
@@ -31,6 +34,12 @@ setup_logging(
 
 logger = get_logger(__name__)
 
+# Migrations run in-process (no extra interpreter boot); paths are absolute so cwd doesn't matter
+_SERVICE_ROOT = os.path.join(os.path.dirname(__file__), "..")
+ALEMBIC_CONFIG = Config(os.path.join(_SERVICE_ROOT, "alembic.ini"))
+ALEMBIC_CONFIG.set_main_option("script_location", os.path.join(_SERVICE_ROOT, "alembic"))
+ALEMBIC_CONFIG.attributes["configure_logger"] = False
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Application lifecycle management"""
@@ -40,17 +49,8 @@ async def lifespan(app: FastAPI):
     try:
         # Run database migrations
         logger.info("Running database migrations")
-        result = subprocess.run(
-            ["alembic", "upgrade", "head"],
-            cwd=os.path.join(os.path.dirname(__file__), ".."),
-            capture_output=True,
-            text=True,
-            check=False
-        )
-        if result.returncode != 0:
-            logger.warning(f"Migration output: {result.stderr}")
-        else:
-            logger.info("Database migrations completed")
+        command.upgrade(ALEMBIC_CONFIG, "head")
+        logger.info("Database migrations completed")
     except Exception as e:
         logger.error(f"Migration error: {e}")
     
@@ -68,6 +68,7 @@ async def lifespan(app: FastAPI):
     
     # Shutdown
     logger.info(f"Shutting down {SERVICE_NAME}")
+    close_http_client()
 
 # Create FastAPI application
 app = FastAPI(
@@ -75,6 +76,7 @@ app = FastAPI(
     description=SERVICE_DESCRIPTION,
     version=SERVICE_VERSION,
     lifespan=lifespan,
+    default_response_class=ORJSONResponse,
     docs_url="/api/docs",
     redoc_url="/api/redoc",
     openapi_url="/api/openapi.json"
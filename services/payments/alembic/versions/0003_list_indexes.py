@@ -0,0 +1,13 @@
+from alembic import op
+
+revision = '0003_list_indexes'
+down_revision = '0002_add_fk_order_id'
+branch_labels = None
+depends_on = None
+
+def upgrade():
+    # order_id/status filters on the /payments/ list endpoint
+    op.create_index('ix_payments_order_status', 'payments', ['order_id', 'status'])
+
+def downgrade():
+    op.drop_index('ix_payments_order_status', table_name='payments')
@@ -1,14 +1,43 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from sqlalchemy import func
 from sqlalchemy.orm import Session
+from typing import Optional
 from app.infrastructure.db import get_db
 from app.application.service import PaymentService
-from app.application.schemas import PaymentCreate, PaymentRead
+from app.application.schemas import PaymentCreate, PaymentRead, PaymentSummaryRead
+from app.domain.models import Payment
+from shared.core import make_etag, not_modified
 
 router = APIRouter(prefix="/payments", tags=["payments"])
 
 @router.get("/", response_model=list[PaymentRead])
-def list_payments(db: Session = Depends(get_db)):
-    return PaymentService(db).list()
+def list_payments(
+    request: Request,
+    response: Response,
+    db: Session = Depends(get_db),
+    order_id: Optional[int] = None,
+    status: Optional[str] = None,
+    min_amount: Optional[float] = None,
+    max_amount: Optional[float] = None,
+    order_by: Optional[str] = Query(None, pattern=r"^-?\w+(,-?\w+)*$", description="Comma-separated columns, '-' prefix for descending"),
+    skip: int = Query(0, ge=0, description="Number of records to skip"),
+    limit: Optional[int] = Query(None, ge=0, description="Maximum number of records to return (all when omitted)"),
+):
+    # Payments are insert-only through this API, so count + max id identify the table state
+    etag = make_etag(*db.query(func.max(Payment.id), func.count(Payment.id)).one())
+    if (cached := not_modified(request, response, etag)) is not None:
+        return cached
+    try:
+        return PaymentService(db).list(
+            order_id=order_id, status=status, min_amount=min_amount, max_amount=max_amount,
+            order_by=order_by.split(",") if order_by else None, skip=skip, limit=limit,
+        )
+    except ValueError as exc:
+        raise HTTPException(status_code=422, detail=str(exc))
+
+@router.get("/summary", response_model=list[PaymentSummaryRead])
+def payments_summary(db: Session = Depends(get_db)):
+    return PaymentService(db).summary()
 
 @router.post("/", response_model=PaymentRead, status_code=201)
 def create_payment(payload: PaymentCreate, db: Session = Depends(get_db)):
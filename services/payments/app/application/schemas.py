@@ -16,3 +16,8 @@ class PaymentRead(BaseModel):
     reference: str
     class Config:
         orm_mode = True
+
+class PaymentSummaryRead(BaseModel):
+    status: str
+    total_amount: float
+    count: int
@@ -1,13 +1,40 @@
+from sqlalchemy import func
 from sqlalchemy.orm import Session
 from app.domain.models import Payment
 from .schemas import PaymentCreate
+from shared.core import order_clauses
+from typing import List, Optional
 
 class PaymentService:
+    SORTABLE = {"id", "order_id", "amount", "method", "status"}
+
     def __init__(self, db: Session):
         self.db = db
 
-    def list(self):
-        return self.db.query(Payment).all()
+    def list(self, order_id: Optional[int] = None, status: Optional[str] = None,
+             min_amount: Optional[float] = None, max_amount: Optional[float] = None,
+             order_by: Optional[List[str]] = None, skip: int = 0, limit: Optional[int] = None):
+        query = self.db.query(Payment)
+        if order_id is not None:
+            query = query.filter(Payment.order_id == order_id)
+        if status is not None:
+            query = query.filter(Payment.status == status)
+        if min_amount is not None:
+            query = query.filter(Payment.amount >= min_amount)
+        if max_amount is not None:
+            query = query.filter(Payment.amount <= max_amount)
+        if order_by:
+            query = query.order_by(*order_clauses(Payment, order_by, self.SORTABLE))
+        return query.offset(skip).limit(limit).all()
+
+    def summary(self):
+        """Totals and counts per status, aggregated by the database."""
+        rows = (
+            self.db.query(Payment.status, func.sum(Payment.amount), func.count(Payment.id))
+            .group_by(Payment.status)
+            .all()
+        )
+        return [{"status": status, "total_amount": float(total or 0), "count": count} for status, total, count in rows]
 
     def create(self, data: PaymentCreate):
         obj = Payment(**data.dict())
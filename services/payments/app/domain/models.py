@@ -1,5 +1,5 @@
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column
-from sqlalchemy import String, Numeric, ForeignKey
+from sqlalchemy import String, Numeric, ForeignKey, Index
 
 class Base(DeclarativeBase):
     pass
@@ -13,3 +13,4 @@ class Payment(Base):
     method: Mapped[str] = mapped_column(String(20))
     status: Mapped[str] = mapped_column(String(20))
     reference: Mapped[str] = mapped_column(String(50))
+    __table_args__ = (Index("ix_payments_order_status", "order_id", "status"),)
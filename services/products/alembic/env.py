@@ -3,7 +3,8 @@ from sqlalchemy import engine_from_config, pool
 from alembic import context
 import os, sys
 config = context.config
-if config.config_file_name is not None:
+# In-process upgrades from the service lifespan keep the app's logging setup
+if config.config_file_name is not None and config.attributes.get("configure_logger", True):
     fileConfig(config.config_file_name)
 PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
 APP_PATH = os.path.join(PROJECT_ROOT, 'app')
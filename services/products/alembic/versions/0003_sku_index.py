@@ -0,0 +1,25 @@
+"""sku index
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2025-11-10 10:00:00
+
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = '0003'
+down_revision = '0002'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # The model declares sku unique+indexed but 0001_init never created the index, so
+    # _generate_sku's ORDER BY sku DESC sorted the whole table. A btree serves DESC via a
+    # backward scan; create_all-built databases already have it, hence if_not_exists.
+    op.create_index('ix_products_sku', 'products', ['sku'], unique=True, if_not_exists=True)
+
+
+def downgrade():
+    op.drop_index('ix_products_sku', table_name='products', if_exists=True)
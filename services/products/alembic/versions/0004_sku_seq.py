@@ -0,0 +1,30 @@
+"""sku sequence
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2025-11-10 10:30:00
+
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = '0004'
+down_revision = '0003'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.execute("CREATE SEQUENCE IF NOT EXISTS products_sku_seq")
+    # Continue after the highest generated SKU so new SKUs stay unique
+    op.execute(r"""
+        SELECT setval('products_sku_seq',
+                      COALESCE(MAX(CAST(substring(sku FROM 4) AS BIGINT)), 0) + 1,
+                      false)
+        FROM products
+        WHERE sku ~ '^SKU\d+$'
+    """)
+
+
+def downgrade():
+    op.execute("DROP SEQUENCE IF EXISTS products_sku_seq")
@@ -0,0 +1,47 @@
+"""row version
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2025-11-10 11:00:00
+
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = '0005'
+down_revision = '0004'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Every insert/update stamps the row with a fresh value from one sequence, so
+    # (sum(version), count) changes on any committed write - unlike updated_at, which
+    # is the writer's transaction start time and can land below the current max.
+    # The trigger covers writes that bypass the ORM's onupdate too.
+    op.execute("CREATE SEQUENCE IF NOT EXISTS products_version_seq")
+    op.execute("""
+        ALTER TABLE products
+        ADD COLUMN IF NOT EXISTS version BIGINT NOT NULL DEFAULT nextval('products_version_seq')
+    """)
+    op.execute("""
+        CREATE OR REPLACE FUNCTION products_bump_version() RETURNS trigger AS $$
+        BEGIN
+            NEW.version := nextval('products_version_seq');
+            RETURN NEW;
+        END
+        $$ LANGUAGE plpgsql
+    """)
+    op.execute("DROP TRIGGER IF EXISTS products_bump_version ON products")
+    op.execute("""
+        CREATE TRIGGER products_bump_version
+        BEFORE UPDATE ON products
+        FOR EACH ROW EXECUTE FUNCTION products_bump_version()
+    """)
+
+
+def downgrade():
+    op.execute("DROP TRIGGER IF EXISTS products_bump_version ON products")
+    op.execute("DROP FUNCTION IF EXISTS products_bump_version()")
+    op.execute("ALTER TABLE products DROP COLUMN IF EXISTS version")
+    op.execute("DROP SEQUENCE IF EXISTS products_version_seq")
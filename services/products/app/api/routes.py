@@ -1,19 +1,33 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from sqlalchemy import func
 from sqlalchemy.orm import Session
+from typing import Optional
 from app.infrastructure.db import get_db
 from app.application.service import ProductService
 from app.application.schemas import ProductCreate, ProductRead
 from app.domain.models import Product
+from shared.core import make_etag, not_modified
 
 router = APIRouter(prefix="/products", tags=["products"])
 
 @router.get("/", response_model=list[ProductRead])
-def list_products(db: Session = Depends(get_db)):
-    return ProductService(db).list()
+def list_products(
+    request: Request,
+    response: Response,
+    db: Session = Depends(get_db),
+    ids: Optional[str] = Query(None, pattern=r"^\d+(,\d+)*$", description="Comma-separated ids to fetch in one call")
+):
+    # Every insert/update stamps a never-used sequence value into the row, so the sum moves
+    # whatever order writers commit in; deletes move the count. max(updated_at) could not
+    # guarantee that (transaction-start timestamps) - see migration 0005.
+    etag = make_etag(*db.query(func.sum(Product.version), func.count(Product.id)).one())
+    if (cached := not_modified(request, response, etag)) is not None:
+        return cached
+    return ProductService(db).list([int(i) for i in ids.split(",")] if ids else None)
 
 @router.get("/{product_id}", response_model=ProductRead)
 def get_product(product_id: int, db: Session = Depends(get_db)):
-    product = db.query(Product).filter(Product.id == product_id).first()
+    product = db.get(Product, product_id)
     if not product:
         raise HTTPException(status_code=404, detail="Product not found")
     return product
@@ -24,7 +38,7 @@ def create_product(payload: ProductCreate, db: Session = Depends(get_db)):
 
 @router.put("/{product_id}", response_model=ProductRead)
 def update_product(product_id: int, payload: ProductCreate, db: Session = Depends(get_db)):
-    product = db.query(Product).filter(Product.id == product_id).first()
+    product = db.get(Product, product_id)
     if not product:
         raise HTTPException(status_code=404, detail="Product not found")
     
@@ -56,7 +70,7 @@ def update_product(product_id: int, payload: ProductCreate, db: Session = Depend
 
 @router.delete("/{product_id}", status_code=204)
 def delete_product(product_id: int, db: Session = Depends(get_db)):
-    product = db.query(Product).filter(Product.id == product_id).first()
+    product = db.get(Product, product_id)
     if not product:
         raise HTTPException(status_code=404, detail="Product not found")
     db.delete(product)
@@ -1,4 +1,6 @@
+from sqlalchemy import text
 from sqlalchemy.orm import Session
+from typing import List, Optional
 from app.domain.models import Product
 from .schemas import ProductCreate
 import random
@@ -10,27 +12,17 @@ class ProductService:
 
     def _generate_sku(self) -> str:
         """Generate a unique SKU in format: SKU#### (sequential)"""
-        # Get the highest existing SKU number
-        latest_product = self.db.query(Product).filter(
-            Product.sku.like('SKU%')
-        ).order_by(Product.sku.desc()).first()
-        
-        if latest_product and latest_product.sku:
-            # Extract the number from SKU format (e.g., SKU0001 -> 1)
-            try:
-                last_num = int(latest_product.sku.replace('SKU', ''))
-                next_num = last_num + 1
-            except (ValueError, AttributeError):
-                # Fallback if SKU format is unexpected
-                next_num = 1
-        else:
-            next_num = 1
+        # nextval is O(1) and race-free across workers, unlike reading back the max SKU
+        next_num = self.db.execute(text("SELECT nextval('products_sku_seq')")).scalar()
         
         # Format as SKU#### with zero-padding
         return f"SKU{next_num:04d}"
 
-    def list(self):
-        return self.db.query(Product).all()
+    def list(self, ids: Optional[List[int]] = None):
+        query = self.db.query(Product)
+        if ids:
+            query = query.filter(Product.id.in_(ids))
+        return query.all()
 
     def create(self, data: ProductCreate):
         # Auto-generate SKU if not provided
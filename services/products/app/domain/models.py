@@ -1,11 +1,16 @@
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column
-from sqlalchemy import String, Numeric, Boolean, Text, DateTime, func
+from sqlalchemy import DDL, BigInteger, String, Numeric, Boolean, Text, DateTime, FetchedValue, Sequence, event, func
 from typing import Optional
 import datetime
 
 class Base(DeclarativeBase):
     pass
 
+# Feeds the #### part of generated SKUs (see migration 0004)
+SKU_SEQ = Sequence("products_sku_seq", metadata=Base.metadata)
+# Stamps products.version on every insert/update; feeds the list ETag (see migration 0005)
+VERSION_SEQ = Sequence("products_version_seq", metadata=Base.metadata)
+
 class Product(Base):
     __tablename__ = "products"
     id: Mapped[int] = mapped_column(primary_key=True)
@@ -25,3 +30,21 @@ class Product(Base):
     seller_badge: Mapped[str] = mapped_column(String(50))
     created_at: Mapped[datetime.datetime] = mapped_column(DateTime, server_default=func.now())
     updated_at: Mapped[datetime.datetime] = mapped_column(DateTime, server_default=func.now(), onupdate=func.now())
+    # Bumped from products_version_seq on every insert/update by a trigger (migration 0005)
+    version: Mapped[int] = mapped_column(BigInteger, server_default=VERSION_SEQ.next_value(),
+                                         server_onupdate=FetchedValue())
+
+# Same trigger as migration 0005, so a create_all-built table fingerprints writes too
+event.listen(Product.__table__, "after_create", DDL("""
+    CREATE OR REPLACE FUNCTION products_bump_version() RETURNS trigger AS $$
+    BEGIN
+        NEW.version := nextval('products_version_seq');
+        RETURN NEW;
+    END
+    $$ LANGUAGE plpgsql
+"""))
+event.listen(Product.__table__, "after_create", DDL("""
+    CREATE TRIGGER products_bump_version
+    BEFORE UPDATE ON products
+    FOR EACH ROW EXECUTE FUNCTION products_bump_version()
+"""))
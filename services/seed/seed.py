@@ -1,4 +1,5 @@
 import csv
+import io
 from pathlib import Path
 from sqlalchemy import create_engine, text
 import time
@@ -64,6 +65,33 @@ COLUMN_RENAMES = {
     "shipments": {"shipment_id": "id"},
 }
 
+# Sequences that number business keys (not ids); resynced past the seeded values
+NUMBER_SEQUENCES = {
+    "orders_ord_seq": ("orders", "order_number", r"^ORD-\d{4}-\d+$"),
+    "products_sku_seq": ("products", "sku", r"^SKU\d+$"),
+}
+
+COPY_NULL = r"\N"
+
+def copy_rows(conn, table: str, cols: list, rows: list) -> int:
+    """COPY rows into a temp table and merge them with ON CONFLICT DO NOTHING; returns rows inserted."""
+    buf = io.StringIO()
+    # COPY csv reads unquoted empty fields as NULL by default; name an explicit NULL marker
+    # so '' stays '' and only missing values (None) become NULL, as with a per-row INSERT
+    csv.writer(buf).writerows([COPY_NULL if r[c] is None else r[c] for c in cols] for r in rows)
+    buf.seek(0)
+    col_list = ",".join(cols)
+    tmp = f"seed_{table}"
+    cur = conn.connection.cursor()
+    try:
+        cur.execute(f"CREATE TEMP TABLE {tmp} AS SELECT {col_list} FROM {table} WITH NO DATA")
+        cur.copy_expert(f"COPY {tmp} ({col_list}) FROM STDIN WITH (FORMAT csv, NULL '{COPY_NULL}')", buf)
+        cur.execute(f"INSERT INTO {table} ({col_list}) SELECT {col_list} FROM {tmp} ON CONFLICT DO NOTHING")
+        return cur.rowcount
+    finally:
+        cur.execute(f"DROP TABLE IF EXISTS {tmp}")
+        cur.close()
+
 # Simple naive loader (assumes tables already exist). For initial run you can rely on service startup migrations (create_all).
 
 def load_table(table: str, file: str):
@@ -95,15 +123,21 @@ def load_table(table: str, file: str):
                     new_r[target_col] = v
             transformed.append(new_r)
         # Align columns after transformation (exclude any columns not in table by attempting insert & ignoring errors)
-        sample_cols = transformed[0].keys()
-        placeholders = ",".join([f":{c}" for c in sample_cols])
-        col_list = ",".join(sample_cols)
-        stmt = text(f"INSERT INTO {table} ({col_list}) VALUES ({placeholders}) ON CONFLICT DO NOTHING")
-        for r in transformed:
-            try:
-                conn.execute(stmt, r)
-            except Exception as e:
-                print(f"Row insert skipped for table {table}: {e}")
+        sample_cols = list(transformed[0].keys())
+        try:
+            # One COPY round trip for the whole file
+            copy_rows(conn, table, sample_cols, transformed)
+        except Exception as e:
+            # A bad row fails the whole COPY; fall back to row-by-row so only that row is skipped
+            print(f"Bulk load failed for table {table} ({e}); inserting row by row")
+            placeholders = ",".join([f":{c}" for c in sample_cols])
+            col_list = ",".join(sample_cols)
+            stmt = text(f"INSERT INTO {table} ({col_list}) VALUES ({placeholders}) ON CONFLICT DO NOTHING")
+            for r in transformed:
+                try:
+                    conn.execute(stmt, r)
+                except Exception as e:
+                    print(f"Row insert skipped for table {table}: {e}")
         print(f"Loaded {len(rows)} rows into {table}")
 
 def main():
@@ -121,6 +155,15 @@ def main():
                 print(f"  Reset {table}_id_seq")
             except Exception as e:
                 print(f"  Warning: Could not reset sequence for {table}: {e}")
+        for seq, (table, column, pattern) in NUMBER_SEQUENCES.items():
+            try:
+                conn.execute(text(
+                    f"SELECT setval('{seq}', COALESCE(MAX(CAST(substring({column} FROM '(\\d+)$') AS BIGINT)), 0) + 1, false) "
+                    f"FROM {table} WHERE {column} ~ :pattern"
+                ), {"pattern": pattern})
+                print(f"  Reset {seq}")
+            except Exception as e:
+                print(f"  Warning: Could not reset sequence {seq}: {e}")
         print("Analyzing tables for updated statistics...")
         for table in TABLE_FILES.keys():
             try:
@@ -7,14 +7,20 @@ branch_labels = None
 depends_on = None
 
 def _wait_for_table(table_name: str, timeout: int = 30):
-    from sqlalchemy import text
+    import time
     bind = op.get_bind()
-    for _ in range(timeout):
-        exists = bind.execute(text("SELECT to_regclass(:t)"), {"t": table_name}).scalar()
-        if exists:
+    # Serialize concurrent shipment replicas so only one probes; held until this migration commits
+    bind.exec_driver_sql("SELECT pg_advisory_xact_lock(hashtext('shipments_fk_wait'))")
+    # Back off from 50ms up to 1s so an early table costs one short wait, not a full second
+    deadline = time.monotonic() + timeout
+    delay = 0.05
+    while True:
+        if bind.exec_driver_sql("SELECT to_regclass(%(t)s)", {"t": table_name}).scalar():
             return True
-        import time
-        time.sleep(1)
+        if time.monotonic() >= deadline:
+            break
+        time.sleep(delay)
+        delay = min(delay * 2, 1.0)
     raise RuntimeError(f"Timed out waiting for table '{table_name}' to exist for FK creation")
 
 def upgrade():
@@ -0,0 +1,13 @@
+from alembic import op
+
+revision = '0004_list_indexes'
+down_revision = '0003_make_delivered_at_nullable'
+branch_labels = None
+depends_on = None
+
+def upgrade():
+    # order_id/status filters on the /shipments/ list endpoint
+    op.create_index('ix_shipments_order_status', 'shipments', ['order_id', 'status'])
+
+def downgrade():
+    op.drop_index('ix_shipments_order_status', table_name='shipments')
@@ -0,0 +1,22 @@
+from alembic import op
+import sqlalchemy as sa
+
+revision = '0005_inflight_index'
+down_revision = '0004_list_indexes'
+branch_labels = None
+depends_on = None
+
+def upgrade():
+    # In-flight queue scans only ever want undelivered rows; the partial index stays small
+    # because delivered shipments dominate. CONCURRENTLY must run outside the transaction.
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_shipments_inflight', 'shipments', ['shipped_at'],
+            postgresql_where=sa.text('delivered_at IS NULL'),
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_shipments_inflight', table_name='shipments', postgresql_concurrently=True)
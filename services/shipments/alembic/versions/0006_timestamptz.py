@@ -0,0 +1,40 @@
+from alembic import op
+import sqlalchemy as sa
+
+revision = '0006_timestamptz'
+down_revision = '0005_inflight_index'
+branch_labels = None
+depends_on = None
+
+def upgrade():
+    # Stored strings without an offset were written as UTC
+    op.execute("SET LOCAL TIME ZONE 'UTC'")
+    op.alter_column(
+        'shipments', 'shipped_at',
+        existing_type=sa.String(length=30),
+        type_=sa.TIMESTAMP(timezone=True),
+        postgresql_using='shipped_at::timestamptz',
+    )
+    op.alter_column(
+        'shipments', 'delivered_at',
+        existing_type=sa.String(length=30),
+        type_=sa.TIMESTAMP(timezone=True),
+        existing_nullable=True,
+        postgresql_using="NULLIF(delivered_at, '')::timestamptz",
+    )
+
+def downgrade():
+    op.execute("SET LOCAL TIME ZONE 'UTC'")
+    op.alter_column(
+        'shipments', 'delivered_at',
+        existing_type=sa.TIMESTAMP(timezone=True),
+        type_=sa.String(length=30),
+        existing_nullable=True,
+        postgresql_using="to_char(delivered_at, 'YYYY-MM-DD\"T\"HH24:MI:SS')",
+    )
+    op.alter_column(
+        'shipments', 'shipped_at',
+        existing_type=sa.TIMESTAMP(timezone=True),
+        type_=sa.String(length=30),
+        postgresql_using="to_char(shipped_at, 'YYYY-MM-DD\"T\"HH24:MI:SS')",
+    )
@@ -1,27 +1,68 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
 from sqlalchemy.orm import Session
 from app.infrastructure.db import get_db
+from app.infrastructure import cache
 from app.application.service import ShipmentService
 from app.application.schemas import ShipmentCreate, ShipmentRead
+from datetime import datetime
 from typing import Optional
 from pydantic import BaseModel
+import orjson
 
 class ShipmentUpdate(BaseModel):
     status: Optional[str] = None
     carrier: Optional[str] = None
     tracking_no: Optional[str] = None
-    delivered_at: Optional[str] = None
+    delivered_at: Optional[datetime] = None
+
+class ShipmentBulkUpdate(ShipmentUpdate):
+    id: int
 
 router = APIRouter(prefix="/shipments", tags=["shipments"])
 
+
 @router.get("/", response_model=list[ShipmentRead])
-def list_shipments(db: Session = Depends(get_db)):
-    return ShipmentService(db).list()
+def list_shipments(
+    request: Request,
+    db: Session = Depends(get_db),
+    order_id: Optional[int] = None,
+    status: Optional[str] = None,
+    carrier: Optional[str] = Query(None, description="Case-insensitive substring match on carrier"),
+    order_by: Optional[str] = Query(None, pattern=r"^-?\w+(,-?\w+)*$", description="Comma-separated columns, '-' prefix for descending"),
+    skip: int = Query(0, ge=0, description="Number of records to skip"),
+    limit: Optional[int] = Query(None, ge=0, description="Maximum number of records to return (all when omitted)"),
+):
+    # Keyed on the normalized query so parameter order doesn't split entries
+    query = "&".join(sorted(f"{k}={v}" for k, v in request.query_params.multi_items()))
+    body = cache.get_list(query)
+    if body is not None:
+        return Response(content=body, media_type="application/json")
+    try:
+        shipments = ShipmentService(db).list(
+            order_id=order_id, status=status, carrier=carrier, order_by=order_by.split(",") if order_by else None, skip=skip, limit=limit,
+        )
+    except ValueError as exc:
+        raise HTTPException(status_code=422, detail=str(exc))
+    # Rows already have exactly the ShipmentRead fields; orjson writes them without a pydantic pass
+    body = orjson.dumps([row._asdict() for row in shipments], option=orjson.OPT_UTC_Z)
+    cache.set_list(query, body)
+    return Response(content=body, media_type="application/json")
 
 @router.post("/", response_model=ShipmentRead, status_code=201)
 def create_shipment(payload: ShipmentCreate, db: Session = Depends(get_db)):
-    return ShipmentService(db).create(payload)
+    shipment = ShipmentService(db).create(payload)
+    cache.invalidate_lists()
+    return shipment
+
+@router.put("/bulk")
+def bulk_update_shipments(payload: list[ShipmentBulkUpdate], db: Session = Depends(get_db)):
+    """Apply a batch of carrier status callbacks in one round trip."""
+    updated = ShipmentService(db).bulk_update([p.model_dump(exclude_unset=True) for p in payload])
+    cache.invalidate_lists()
+    return {"updated": updated}
 
 @router.put("/{shipment_id}", response_model=ShipmentRead)
 def update_shipment(shipment_id: int, payload: ShipmentUpdate, db: Session = Depends(get_db)):
-    return ShipmentService(db).update(shipment_id, payload)
+    shipment = ShipmentService(db).update(shipment_id, payload)
+    cache.invalidate_lists()
+    return shipment
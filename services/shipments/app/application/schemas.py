@@ -1,4 +1,5 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
+from datetime import datetime
 from typing import Optional
 
 class ShipmentCreate(BaseModel):
@@ -6,8 +7,8 @@ class ShipmentCreate(BaseModel):
     carrier: Optional[str] = None
     status: Optional[str] = "PENDING"
     tracking_no: Optional[str] = None
-    shipped_at: Optional[str] = None
-    delivered_at: Optional[str] = None
+    shipped_at: Optional[datetime] = None
+    delivered_at: Optional[datetime] = None
 
 class ShipmentRead(BaseModel):
     id: int
@@ -15,7 +16,6 @@ class ShipmentRead(BaseModel):
     carrier: str
     status: str
     tracking_no: str
-    shipped_at: str
-    delivered_at: Optional[str] = None
-    class Config:
-        orm_mode = True
+    shipped_at: datetime
+    delivered_at: Optional[datetime] = None
+    model_config = ConfigDict(from_attributes=True)
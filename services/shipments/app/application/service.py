@@ -1,48 +1,93 @@
+from sqlalchemy import insert, select, text, update
 from sqlalchemy.orm import Session
 from app.domain.models import Shipment
-from .schemas import ShipmentCreate
+from .schemas import ShipmentCreate, ShipmentRead
+from shared.core import order_clauses
 from fastapi import HTTPException
-from datetime import datetime
+from datetime import datetime, timezone
+import time
+from typing import List, Optional
 
 class ShipmentService:
+    SORTABLE = {"id", "order_id", "carrier", "status", "shipped_at", "delivered_at"}
+
     def __init__(self, db: Session):
         self.db = db
 
-    def list(self):
-        return self.db.query(Shipment).all()
+    def list(self, order_id: Optional[int] = None, status: Optional[str] = None,
+             carrier: Optional[str] = None, order_by: Optional[List[str]] = None,
+             skip: int = 0, limit: Optional[int] = None):
+        # Plain column rows: no ORM instances or identity-map bookkeeping for a read-only list
+        stmt = select(*(getattr(Shipment, f) for f in ShipmentRead.model_fields))
+        if order_id is not None:
+            stmt = stmt.where(Shipment.order_id == order_id)
+        if status is not None:
+            stmt = stmt.where(Shipment.status == status)
+        if carrier is not None:
+            stmt = stmt.where(Shipment.carrier.ilike(f"%{carrier}%"))
+        if order_by:
+            stmt = stmt.order_by(*order_clauses(Shipment, order_by, self.SORTABLE))
+        # Row is SQLAlchemy's C-implemented named tuple; trusted table data needs no model
+        return self.db.execute(stmt.offset(skip).limit(limit)).all()
 
     def create(self, data: ShipmentCreate):
-        payload = data.dict(exclude_unset=True)
+        payload = data.model_dump(exclude_unset=True)
         # Apply safe defaults for optional fields
-        now_iso = datetime.utcnow().isoformat()
         status = payload.get("status") or "PENDING"
         if not payload.get("carrier"):
             payload["carrier"] = "Standard Delivery"
         if not payload.get("tracking_no"):
-            # Simple deterministic tracking number
-            payload["tracking_no"] = f"TRK{payload['order_id']}{int(datetime.utcnow().timestamp())}"
+            # Order id + nanosecond clock: no datetime churn, and distinct within the same second
+            payload["tracking_no"] = f"TRK{payload['order_id']}{time.time_ns()}"
         if not payload.get("shipped_at"):
             # Ensure DB non-null constraint is satisfied
-            payload["shipped_at"] = now_iso
+            payload["shipped_at"] = datetime.now(timezone.utc)
         # delivered_at can remain None until delivered
         payload["status"] = status
 
-        obj = Shipment(**payload)
-        self.db.add(obj)
+        # INSERT ... RETURNING hands back the stored row; no refresh SELECT after commit
+        obj = self.db.execute(insert(Shipment).values(**payload).returning(Shipment)).scalar_one()
         self.db.commit()
-        self.db.refresh(obj)
         return obj
     
     def update(self, shipment_id: int, data):
-        shipment = self.db.query(Shipment).filter(Shipment.id == shipment_id).first()
+        # Update only provided fields
+        update_data = data.model_dump(exclude_unset=True)
+        if not update_data:
+            shipment = self.db.get(Shipment, shipment_id)
+        else:
+            # Tracking-status writes tolerate losing the last moments on a crash, so don't wait
+            # for the WAL fsync at commit (this transaction only)
+            self.db.execute(text("SET LOCAL synchronous_commit = off"))
+            # One UPDATE ... RETURNING round trip instead of SELECT, UPDATE and refresh
+            stmt = (update(Shipment).where(Shipment.id == shipment_id).values(**update_data)
+                    .returning(Shipment).execution_options(synchronize_session=False))
+            shipment = self.db.execute(stmt).scalar_one_or_none()
         if not shipment:
             raise HTTPException(status_code=404, detail="Shipment not found")
         
-        # Update only provided fields
-        update_data = data.dict(exclude_unset=True)
-        for key, value in update_data.items():
-            setattr(shipment, key, value)
-        
         self.db.commit()
-        self.db.refresh(shipment)
         return shipment
+
+    def bulk_update(self, updates: List[dict]) -> int:
+        """Apply many partial updates (each dict carries the shipment id) in one executemany.
+
+        All-or-nothing: unknown ids fail the whole batch with 404, like the single-item PUT.
+        Returns the number of shipments updated.
+        """
+        ids = {u["id"] for u in updates}
+        # Lock the targets so every id checked here is still there for the UPDATE
+        found = set(self.db.scalars(
+            select(Shipment.id).where(Shipment.id.in_(ids)).with_for_update()
+        ))
+        missing = sorted(ids - found)
+        if missing:
+            self.db.rollback()
+            raise HTTPException(status_code=404, detail={"message": "Shipments not found", "missing_ids": missing})
+        rows = [u for u in updates if len(u) > 1]
+        if rows:
+            self.db.execute(text("SET LOCAL synchronous_commit = off"))
+            # ORM bulk UPDATE by primary key: one prepared UPDATE per distinct key set
+            self.db.execute(update(Shipment), rows)
+        self.db.commit()
+        return len({u["id"] for u in rows})
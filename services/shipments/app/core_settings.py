@@ -1,5 +1,6 @@
 from pydantic_settings import BaseSettings
 from functools import lru_cache
+from typing import Optional
 
 class Settings(BaseSettings):
     POSTGRES_HOST: str = "postgres"
@@ -7,6 +8,14 @@ class Settings(BaseSettings):
     POSTGRES_DB: str = "eci"
     POSTGRES_USER: str = "eci"
     POSTGRES_PASSWORD: str = "eci"
+    # Connection pool; tune per environment via env vars
+    POOL_SIZE: int = 20
+    MAX_OVERFLOW: int = 40
+    POOL_TIMEOUT: int = 30
+    POOL_RECYCLE: int = 1800
+    # Read-through cache for GET /shipments/ (disabled when REDIS_URL is unset)
+    REDIS_URL: Optional[str] = None
+    LIST_CACHE_TTL_SECONDS: int = 5
 
     class Config:
         env_file = ".env"
@@ -1,6 +1,7 @@
+from datetime import datetime
 from typing import Optional
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column
-from sqlalchemy import String
+from sqlalchemy import String, Index, DateTime, text
 
 class Base(DeclarativeBase):
     pass
@@ -13,6 +14,10 @@ class Shipment(Base):
     carrier: Mapped[str] = mapped_column(String(50))
     status: Mapped[str] = mapped_column(String(30))
     tracking_no: Mapped[str] = mapped_column(String(50))
-    shipped_at: Mapped[str] = mapped_column(String(30))
+    shipped_at: Mapped[datetime] = mapped_column(DateTime(timezone=True))
     # delivered_at can be null until the shipment is delivered
-    delivered_at: Mapped[Optional[str]] = mapped_column(String(30), nullable=True)
+    delivered_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True)
+    __table_args__ = (
+        Index("ix_shipments_order_status", "order_id", "status"),
+        Index("ix_shipments_inflight", "shipped_at", postgresql_where=text("delivered_at IS NULL")),
+    )
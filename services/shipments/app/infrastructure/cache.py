@@ -0,0 +1,42 @@
+import redis
+from typing import Optional
+from app.core_settings import get_settings
+
+settings = get_settings()
+
+# Same version key the gateway bumps on shipment writes, so a write through either side
+# retires both caches. Stale entries simply age out via TTL.
+VERSION_KEY = "ver:shipments"
+
+_redis = redis.Redis.from_url(
+    settings.REDIS_URL, socket_connect_timeout=0.5, socket_timeout=0.5
+) if settings.REDIS_URL else None
+
+def _list_key(query: str) -> str:
+    version = int(_redis.get(VERSION_KEY) or 0)
+    return f"shipments:list:v{version}:{query}"
+
+def get_list(query: str) -> Optional[bytes]:
+    """Cached serialized list response for this query string, if any. Best effort."""
+    if _redis is None:
+        return None
+    try:
+        return _redis.get(_list_key(query))
+    except redis.RedisError:
+        return None
+
+def set_list(query: str, body: bytes) -> None:
+    if _redis is None:
+        return
+    try:
+        _redis.setex(_list_key(query), settings.LIST_CACHE_TTL_SECONDS, body)
+    except redis.RedisError:
+        pass
+
+def invalidate_lists() -> None:
+    if _redis is None:
+        return
+    try:
+        _redis.incr(VERSION_KEY)
+    except redis.RedisError:
+        pass
@@ -5,7 +5,18 @@ from app.domain.models import Base
 
 settings = get_settings()
 DATABASE_URL = f"postgresql+psycopg2://{settings.POSTGRES_USER}:{settings.POSTGRES_PASSWORD}@{settings.POSTGRES_HOST}:{settings.POSTGRES_PORT}/{settings.POSTGRES_DB}"
-engine = create_engine(DATABASE_URL, echo=False, future=True)
+engine = create_engine(
+    DATABASE_URL,
+    echo=False,
+    future=True,
+    pool_size=settings.POOL_SIZE,
+    max_overflow=settings.MAX_OVERFLOW,
+    pool_timeout=settings.POOL_TIMEOUT,
+    # Pre-ping catches connections dropped by a database restart/failover; recycling retires
+    # them before server-side idle timeouts
+    pool_pre_ping=True,
+    pool_recycle=settings.POOL_RECYCLE,
+)
 SessionLocal = sessionmaker(bind=engine, autoflush=False, autocommit=False, expire_on_commit=False)
 
 def get_db() -> Session:
@@ -1,6 +1,6 @@
 """Shared core utilities for microservices.
 
-Provides common health check and logging functionality across all services.
+Provides common health check, logging, HTTP caching and query functionality across all services.
 """
 
 from .health import ServiceHealth, HealthStatus
@@ -10,8 +10,10 @@ from .logging_config import (
     RequestLoggingMiddleware,
     set_request_context,
     generate_request_id,
-    LoggerAdapter,
+    ContextFilter,
 )
+from .http_cache import make_etag, not_modified
+from .query import order_clauses
 
 __all__ = [
     # Health checks
@@ -23,5 +25,10 @@ __all__ = [
     "RequestLoggingMiddleware",
     "set_request_context",
     "generate_request_id",
-    "LoggerAdapter",
+    "ContextFilter",
+    # HTTP caching
+    "make_etag",
+    "not_modified",
+    # Query helpers
+    "order_clauses",
 ]
@@ -6,8 +6,8 @@ Implements health checks as per:
 """
 
 from fastapi import APIRouter, status
-from fastapi.responses import JSONResponse
-from sqlalchemy import create_engine, text
+from fastapi.responses import ORJSONResponse
+from sqlalchemy import create_engine
 from typing import Dict, Any, Optional
 import os
 import time
@@ -20,6 +20,9 @@ import logging
 
 logger = logging.getLogger(__name__)
 
+def _utc_now_iso() -> str:
+    return datetime.utcnow().isoformat() + "Z"
+
 class HealthStatus(str, Enum):
     """Health status values following industry standards"""
     PASS = "pass"
@@ -34,12 +37,44 @@ class ServiceHealth:
     - Netflix Hystrix circuit breaker patterns
     """
     
-    def __init__(self, service_name: str, version: str = "1.0.0"):
+    # Static parts of the readiness check results; copied and filled in per probe
+    _DB_PASS = {"status": HealthStatus.PASS, "componentType": "datastore", "observedUnit": "ms"}
+    _DB_FAIL = {"status": HealthStatus.FAIL, "componentType": "datastore"}
+    _CACHE_PASS = {"status": HealthStatus.PASS, "componentType": "cache", "observedUnit": "ms"}
+    _CACHE_WARN = {"status": HealthStatus.WARN, "componentType": "cache"}
+    _DISK = {"componentType": "system", "observedUnit": "GB"}
+    _MEMORY = {"componentType": "system", "observedUnit": "MB"}
+    _SYSTEM_WARN = {"status": HealthStatus.WARN, "componentType": "system"}
+    _MIGRATIONS_PASS = {"status": HealthStatus.PASS, "componentType": "datastore"}
+    _MIGRATIONS_WARN = {"status": HealthStatus.WARN, "componentType": "datastore",
+                        "output": "Migrations table not found"}
+    _CONFIG_PASS = {"status": HealthStatus.PASS, "componentType": "configuration"}
+    _CONFIG_FAIL = {"status": HealthStatus.FAIL, "componentType": "configuration"}
+    
+    def __init__(self, service_name: str, version: str = "1.0.0", version_table: Optional[str] = None):
         self.service_name = service_name
         self.version = version
+        # Each service keeps its own Alembic version table (alembic_version_<service>)
+        self.version_table = version_table or f"alembic_version_{service_name.removesuffix('-service')}"
         self.start_time = time.time()
         self.checks_performed = 0
         self.last_check_time = None
+        # One small pool shared by every probe; create_engine does not connect until first use
+        self._engine = create_engine(
+            self._get_database_url(),
+            pool_size=1,
+            max_overflow=0,
+            pool_pre_ping=True,
+            pool_recycle=300,
+        )
+        # Pooled client so each ping reuses a live connection
+        redis_url = os.getenv("REDIS_URL")
+        self._redis = redis.Redis.from_url(
+            redis_url,
+            socket_connect_timeout=1,
+            socket_keepalive=True,
+            health_check_interval=30,
+        ) if redis_url else None
         
     def create_health_router(self) -> APIRouter:
         """Create health check router with industry-standard endpoints"""
@@ -56,7 +91,7 @@ class ServiceHealth:
                 "service": self.service_name,
                 "version": self.version,
                 "releaseId": os.getenv("RELEASE_ID", "unknown"),
-                "timestamp": datetime.utcnow().isoformat() + "Z"
+                "timestamp": _utc_now_iso()
             }
         
         @router.get("/health/live", status_code=status.HTTP_200_OK)
@@ -65,12 +100,14 @@ class ServiceHealth:
             return {"status": "alive"}
         
         @router.get("/health/ready")
-        async def readiness() -> JSONResponse:
+        async def readiness() -> ORJSONResponse:
             """
             Readiness probe - comprehensive health check
             Checks all dependencies and returns detailed status
             """
-            checks = await self._perform_readiness_checks()
+            # One timestamp per probe, shared by every check result and the response
+            now = _utc_now_iso()
+            checks = await self._perform_readiness_checks(now)
             
             # Determine overall status
             overall_status = self._calculate_overall_status(checks)
@@ -86,10 +123,10 @@ class ServiceHealth:
                 "links": {},
                 "serviceId": self.service_name,
                 "description": f"{self.service_name} microservice",
-                "timestamp": datetime.utcnow().isoformat() + "Z"
+                "timestamp": now
             }
             
-            return JSONResponse(status_code=status_code, content=response)
+            return ORJSONResponse(status_code=status_code, content=response)
         
         @router.get("/health/startup")
         async def startup() -> Dict[str, Any]:
@@ -97,11 +134,11 @@ class ServiceHealth:
             Kubernetes startup probe endpoint
             Used during initial container startup
             """
-            checks = await self._perform_startup_checks()
+            checks = await self._perform_startup_checks(_utc_now_iso())
             status_val = self._calculate_overall_status(checks)
             
             if status_val != HealthStatus.PASS:
-                return JSONResponse(
+                return ORJSONResponse(
                     status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
                     content={"status": "starting", "checks": checks}
                 )
@@ -114,119 +151,109 @@ class ServiceHealth:
             Prometheus-compatible metrics endpoint
             Following OpenMetrics specification
             """
-            memory = psutil.Process().memory_info()
-            cpu_percent = psutil.Process().cpu_percent()
+            memory, cpu_percent, num_threads = await asyncio.to_thread(self._process_stats)
             
             return {
                 "service": self.service_name,
                 "version": self.version,
                 "uptime_seconds": time.time() - self.start_time,
                 "checks_performed": self.checks_performed,
-                "timestamp": datetime.utcnow().isoformat() + "Z",
+                "timestamp": _utc_now_iso(),
                 "system": {
                     "memory_rss_bytes": memory.rss,
                     "memory_vms_bytes": memory.vms,
                     "cpu_percent": cpu_percent,
-                    "num_threads": psutil.Process().num_threads()
+                    "num_threads": num_threads
                 }
             }
         
         return router
     
-    async def _perform_readiness_checks(self) -> Dict[str, Dict[str, Any]]:
+    async def _perform_readiness_checks(self, now: str) -> Dict[str, Dict[str, Any]]:
         """Perform comprehensive readiness checks"""
         self.checks_performed += 1
         self.last_check_time = time.time()
         
-        checks = {}
-        
-        # Database check
-        checks["database:connectivity"] = await self._check_database()
+        # Network checks are independent: run them together so the probe costs max(), not sum()
+        probes = {"database:connectivity": self._check_database(now)}
         
         # Redis check (if configured)
-        if os.getenv("REDIS_URL"):
-            checks["cache:connectivity"] = await self._check_redis()
+        if self._redis is not None:
+            probes["cache:connectivity"] = self._check_redis(now)
         
         # Disk space check
-        checks["storage:disk_space"] = self._check_disk_space()
+        probes["storage:disk_space"] = self._check_disk_space(now)
         
         # Memory check
-        checks["system:memory"] = self._check_memory()
+        probes["system:memory"] = self._check_memory(now)
+        
+        checks = dict(zip(probes, await asyncio.gather(*probes.values())))
         
         return checks
     
-    async def _perform_startup_checks(self) -> Dict[str, Dict[str, Any]]:
+    async def _perform_startup_checks(self, now: str) -> Dict[str, Dict[str, Any]]:
         """Perform startup-specific checks"""
         checks = {}
         
         # Check database migrations
-        checks["database:migrations"] = await self._check_migrations()
+        checks["database:migrations"] = await self._check_migrations(now)
         
         # Check required environment variables
-        checks["config:environment"] = self._check_environment()
+        checks["config:environment"] = self._check_environment(now)
         
         return checks
     
-    async def _check_database(self) -> Dict[str, Any]:
+    async def _check_database(self, now: str) -> Dict[str, Any]:
         """Check database connectivity with timeout"""
         try:
             start_time = time.time()
-            db_url = self._get_database_url()
             
-            engine = create_engine(db_url, pool_pre_ping=True)
-            with engine.connect() as conn:
-                result = conn.execute(text("SELECT 1"))
-                result.fetchone()
+            await asyncio.to_thread(self._ping_database)
             
             response_time = (time.time() - start_time) * 1000
             
-            return {
-                "status": HealthStatus.PASS,
-                "componentType": "datastore",
-                "observedValue": f"{response_time:.2f}ms",
-                "observedUnit": "ms",
-                "time": datetime.utcnow().isoformat() + "Z"
-            }
+            return self._result(self._DB_PASS, now, observedValue=f"{response_time:.2f}ms")
         except Exception as e:
             logger.error(f"Database health check failed: {e}")
-            return {
-                "status": HealthStatus.FAIL,
-                "componentType": "datastore",
-                "output": str(e),
-                "time": datetime.utcnow().isoformat() + "Z"
-            }
+            return self._result(self._DB_FAIL, now, output=str(e))
+    
+    @staticmethod
+    def _result(template: Dict[str, Any], now: str, **fields: Any) -> Dict[str, Any]:
+        """Copy a check result template and fill in the per-probe fields"""
+        result = template.copy()
+        result.update(fields)
+        result["time"] = now
+        return result
+    
+    def _ping_database(self) -> None:
+        with self._engine.connect() as conn:
+            conn.exec_driver_sql("SELECT 1").fetchone()
     
-    async def _check_redis(self) -> Dict[str, Any]:
+    async def _check_redis(self, now: str) -> Dict[str, Any]:
         """Check Redis connectivity"""
         try:
             start_time = time.time()
-            redis_url = os.getenv("REDIS_URL", "redis://redis:6379/0")
             
-            r = redis.from_url(redis_url, socket_connect_timeout=1)
-            r.ping()
+            await asyncio.to_thread(self._redis.ping)
             
             response_time = (time.time() - start_time) * 1000
             
-            return {
-                "status": HealthStatus.PASS,
-                "componentType": "cache",
-                "observedValue": f"{response_time:.2f}ms",
-                "observedUnit": "ms",
-                "time": datetime.utcnow().isoformat() + "Z"
-            }
+            return self._result(self._CACHE_PASS, now, observedValue=f"{response_time:.2f}ms")
         except Exception as e:
             # Redis failure is usually not critical
-            return {
-                "status": HealthStatus.WARN,
-                "componentType": "cache",
-                "output": str(e),
-                "time": datetime.utcnow().isoformat() + "Z"
-            }
+            return self._result(self._CACHE_WARN, now, output=str(e))
+    
+    @staticmethod
+    def _process_stats():
+        """Memory info, CPU percent and thread count read in one pass over /proc/self"""
+        process = psutil.Process()
+        with process.oneshot():
+            return process.memory_info(), process.cpu_percent(), process.num_threads()
     
-    def _check_disk_space(self) -> Dict[str, Any]:
+    async def _check_disk_space(self, now: str) -> Dict[str, Any]:
         """Check available disk space"""
         try:
-            disk = psutil.disk_usage('/')
+            disk = await asyncio.to_thread(psutil.disk_usage, '/')
             free_gb = disk.free / (1024 ** 3)
             
             if free_gb < 1:
@@ -236,25 +263,14 @@ class ServiceHealth:
             else:
                 status_val = HealthStatus.PASS
             
-            return {
-                "status": status_val,
-                "componentType": "system",
-                "observedValue": f"{free_gb:.2f}",
-                "observedUnit": "GB",
-                "time": datetime.utcnow().isoformat() + "Z"
-            }
+            return self._result(self._DISK, now, status=status_val, observedValue=f"{free_gb:.2f}")
         except Exception as e:
-            return {
-                "status": HealthStatus.WARN,
-                "componentType": "system",
-                "output": str(e),
-                "time": datetime.utcnow().isoformat() + "Z"
-            }
+            return self._result(self._SYSTEM_WARN, now, output=str(e))
     
-    def _check_memory(self) -> Dict[str, Any]:
+    async def _check_memory(self, now: str) -> Dict[str, Any]:
         """Check available memory"""
         try:
-            memory = psutil.virtual_memory()
+            memory = await asyncio.to_thread(psutil.virtual_memory)
             available_mb = memory.available / (1024 ** 2)
             
             if available_mb < 100:
@@ -264,60 +280,30 @@ class ServiceHealth:
             else:
                 status_val = HealthStatus.PASS
             
-            return {
-                "status": status_val,
-                "componentType": "system",
-                "observedValue": f"{available_mb:.2f}",
-                "observedUnit": "MB",
-                "time": datetime.utcnow().isoformat() + "Z"
-            }
+            return self._result(self._MEMORY, now, status=status_val, observedValue=f"{available_mb:.2f}")
         except Exception as e:
-            return {
-                "status": HealthStatus.WARN,
-                "componentType": "system",
-                "output": str(e),
-                "time": datetime.utcnow().isoformat() + "Z"
-            }
+            return self._result(self._SYSTEM_WARN, now, output=str(e))
     
-    async def _check_migrations(self) -> Dict[str, Any]:
+    async def _check_migrations(self, now: str) -> Dict[str, Any]:
         """Check if database migrations are up to date"""
         try:
-            db_url = self._get_database_url()
-            engine = create_engine(db_url)
+            exists = await asyncio.to_thread(self._version_table_exists)
             
-            with engine.connect() as conn:
-                # Check if alembic_version table exists
-                result = conn.execute(text("""
-                    SELECT EXISTS (
-                        SELECT 1 FROM information_schema.tables 
-                        WHERE table_schema = 'public' 
-                        AND table_name = 'alembic_version'
-                    )
-                """))
-                exists = result.scalar()
-                
-                if exists:
-                    return {
-                        "status": HealthStatus.PASS,
-                        "componentType": "datastore",
-                        "time": datetime.utcnow().isoformat() + "Z"
-                    }
-                else:
-                    return {
-                        "status": HealthStatus.WARN,
-                        "componentType": "datastore",
-                        "output": "Migrations table not found",
-                        "time": datetime.utcnow().isoformat() + "Z"
-                    }
+            if exists:
+                return self._result(self._MIGRATIONS_PASS, now)
+            else:
+                return self._result(self._MIGRATIONS_WARN, now)
         except Exception as e:
-            return {
-                "status": HealthStatus.FAIL,
-                "componentType": "datastore",
-                "output": str(e),
-                "time": datetime.utcnow().isoformat() + "Z"
-            }
+            return self._result(self._DB_FAIL, now, output=str(e))
+    
+    def _version_table_exists(self) -> bool:
+        # to_regclass is a single catalog lookup, unlike a scan of the information_schema.tables view
+        with self._engine.connect() as conn:
+            return conn.exec_driver_sql(
+                "SELECT to_regclass(%(t)s) IS NOT NULL", {"t": f"public.{self.version_table}"}
+            ).scalar()
     
-    def _check_environment(self) -> Dict[str, Any]:
+    def _check_environment(self, now: str) -> Dict[str, Any]:
         """Check required environment variables"""
         required_vars = [
             "POSTGRES_HOST",
@@ -329,18 +315,10 @@ class ServiceHealth:
         missing = [var for var in required_vars if not os.getenv(var)]
         
         if missing:
-            return {
-                "status": HealthStatus.FAIL,
-                "componentType": "configuration",
-                "output": f"Missing environment variables: {', '.join(missing)}",
-                "time": datetime.utcnow().isoformat() + "Z"
-            }
+            return self._result(self._CONFIG_FAIL, now,
+                                output=f"Missing environment variables: {', '.join(missing)}")
         
-        return {
-            "status": HealthStatus.PASS,
-            "componentType": "configuration",
-            "time": datetime.utcnow().isoformat() + "Z"
-        }
+        return self._result(self._CONFIG_PASS, now)
     
     def _get_database_url(self) -> str:
         """Get database URL from environment"""
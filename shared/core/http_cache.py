@@ -0,0 +1,37 @@
+"""
+Conditional GET support (ETag / If-None-Match) for read-heavy list endpoints.
+
+The ETag is a fingerprint of table state taken with one cheap aggregate query, so unchanged
+lists are answered with 304 before loading any rows. The fingerprint must move on every
+committed write: a per-write version (e.g. SUM(version) + COUNT(*)) does, while
+MAX(updated_at) does not when updated_at is the writer's transaction start time.
+"""
+
+import hashlib
+from typing import Any, Optional
+from fastapi import Request, Response
+
+# no-cache: clients and proxies may store the list but must revalidate every reuse, so a
+# write is visible on the next request (a 304 when nothing changed) rather than after a
+# max-age window. private: lists sit behind per-user auth at the gateway.
+LIST_CACHE_CONTROL = "private, no-cache"
+
+
+def make_etag(*parts: Any) -> str:
+    """Strong ETag from the given state fingerprint."""
+    return '"' + hashlib.md5(":".join(map(str, parts)).encode()).hexdigest() + '"'
+
+
+def not_modified(request: Request, response: Response, etag: str) -> Optional[Response]:
+    """
+    Attach ETag/Cache-Control to the response.
+
+    Returns a 304 response to send instead when the client's If-None-Match already
+    names this version, otherwise None.
+    """
+    headers = {"ETag": etag, "Cache-Control": LIST_CACHE_CONTROL}
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match and (if_none_match.strip() == "*" or etag in (t.strip() for t in if_none_match.split(","))):
+        return Response(status_code=304, headers=headers)
+    response.headers.update(headers)
+    return None
@@ -6,22 +6,36 @@ Implements patterns from:
 - Datadog APM logging guidelines
 """
 
+import atexit
 import logging
+import logging.handlers
+import os
+import queue
+import re
 import sys
-import json
-import traceback
-from datetime import datetime
+import threading
+import time
+import orjson
 from typing import Any, Dict, Optional
 from contextvars import ContextVar
+from dataclasses import dataclass
 import uuid
-from fastapi import Request
-from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.responses import Response
 
 # Context variables for request tracking
-request_id_var: ContextVar[Optional[str]] = ContextVar('request_id', default=None)
-correlation_id_var: ContextVar[Optional[str]] = ContextVar('correlation_id', default=None)
-user_id_var: ContextVar[Optional[str]] = ContextVar('user_id', default=None)
+@dataclass(frozen=True, slots=True)
+class TraceContext:
+    """Request context for distributed tracing, held in a single ContextVar"""
+    request_id: Optional[str] = None
+    correlation_id: Optional[str] = None
+    user_id: Optional[str] = None
+
+# One var instead of three: a single get/set (one context mapping copy) per access
+_EMPTY = TraceContext()
+_trace_ctx_var: ContextVar[TraceContext] = ContextVar('trace', default=_EMPTY)
+
+# NAIVE_UTC/UTC_Z cover datetimes passed in extra_fields; NON_STR_KEYS covers
+# int/enum keys there that stdlib json used to coerce
+_ORJSON_OPTIONS = orjson.OPT_NAIVE_UTC | orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS
 
 class StructuredFormatter(logging.Formatter):
     """
@@ -32,39 +46,65 @@ class StructuredFormatter(logging.Formatter):
     - Datadog Log Management
     """
 
+    # Source location is only worth its bytes on records someone will debug
+    LOCATION_MIN_LEVEL = logging.WARNING
+
+    def __init__(self):
+        super().__init__()
+        # Process-wide constants; setup_logging sets SERVICE_NAME before building us
+        self._service = os.getenv('SERVICE_NAME', 'unknown-service')
+        self._env = os.getenv('ENVIRONMENT', 'development')
+        self._version = os.getenv('SERVICE_VERSION', '1.0.0')
+        # Per-record keys are placeholders so copies keep the original field order
+        self._base = {
+            "@timestamp": None,
+            "level": None,
+            "logger": None,
+            "message": None,
+            "service": self._service,
+            "environment": self._env,
+            "version": self._version,
+        }
+
     def format(self, record: logging.LogRecord) -> str:
         """Format log record as structured JSON"""
+        return self.format_bytes(record).decode()
+
+    def format_bytes(self, record: logging.LogRecord) -> bytes:
+        """Format log record as UTF-8 JSON, straight from orjson"""
 
         # Build base log structure
-        log_obj = {
-            "@timestamp": datetime.utcnow().isoformat() + "Z",
-            "level": record.levelname,
-            "logger": record.name,
-            "message": record.getMessage(),
-            "service": self._get_service_name(),
-            "environment": self._get_environment(),
-            "version": self._get_version(),
-        }
+        log_obj = self._base.copy()
+        # Reuse the timestamp logging already took instead of building a datetime
+        log_obj["@timestamp"] = (
+            f"{time.strftime('%Y-%m-%dT%H:%M:%S', time.gmtime(record.created))}"
+            f".{int(record.msecs):03d}Z"
+        )
+        log_obj["level"] = record.levelname
+        log_obj["logger"] = record.name
+        log_obj["message"] = record.getMessage()
 
         # Add trace context if available
-        trace_context = self._get_trace_context()
+        trace_context = self._get_trace_context(record)
         if trace_context:
             log_obj["trace"] = trace_context
 
-        # Add location information
-        log_obj["location"] = {
-            "file": record.pathname,
-            "line": record.lineno,
-            "function": record.funcName,
-            "module": record.module
-        }
+        # Add location information (flat keys: no nested dict per record)
+        if record.levelno >= self.LOCATION_MIN_LEVEL:
+            log_obj["loc_file"] = record.pathname
+            log_obj["loc_line"] = record.lineno
+            log_obj["loc_func"] = record.funcName
+            log_obj["loc_mod"] = record.module
 
         # Add exception information if present
         if record.exc_info:
+            # Format once per record; exc_text is shared by every handler
+            if not record.exc_text:
+                record.exc_text = self.formatException(record.exc_info)
             log_obj["error"] = {
                 "type": record.exc_info[0].__name__,
                 "message": str(record.exc_info[1]),
-                "stacktrace": traceback.format_exception(*record.exc_info)
+                "stacktrace": record.exc_text
             }
 
         # Add custom fields from extra
@@ -77,28 +117,14 @@ class StructuredFormatter(logging.Formatter):
                 "duration_ms": record.duration_ms
             }
 
-        return json.dumps(log_obj, default=str)
-
-    def _get_service_name(self) -> str:
-        """Get service name from environment or default"""
-        import os
-        return os.getenv('SERVICE_NAME', 'unknown-service')
+        return orjson.dumps(log_obj, default=str, option=_ORJSON_OPTIONS)
 
-    def _get_environment(self) -> str:
-        """Get environment (dev/staging/prod)"""
-        import os
-        return os.getenv('ENVIRONMENT', 'development')
-
-    def _get_version(self) -> str:
-        """Get service version"""
-        import os
-        return os.getenv('SERVICE_VERSION', '1.0.0')
-
-    def _get_trace_context(self) -> Optional[Dict[str, Any]]:
-        """Get distributed tracing context"""
-        request_id = request_id_var.get()
-        correlation_id = correlation_id_var.get()
-        user_id = user_id_var.get()
+    def _get_trace_context(self, record: logging.LogRecord) -> Optional[Dict[str, Any]]:
+        """Get distributed tracing context stamped on the record by ContextFilter"""
+        attrs = record.__dict__
+        request_id = attrs.get('request_id')
+        correlation_id = attrs.get('correlation_id')
+        user_id = attrs.get('user_id')
 
         if not any([request_id, correlation_id, user_id]):
             return None
@@ -113,13 +139,29 @@ class StructuredFormatter(logging.Formatter):
 
         return context
 
+class ContextFilter(logging.Filter):
+    """
+    Filter to stamp request context onto log records
+    Used for distributed tracing; must run on the thread that logged the record
+    """
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        ctx = _trace_ctx_var.get()
+        # Records logged outside a request carry no context attributes
+        if ctx is not _EMPTY:
+            record.request_id = ctx.request_id
+            record.correlation_id = ctx.correlation_id
+            record.user_id = ctx.user_id
+        return True
+
 class PerformanceFilter(logging.Filter):
     """Filter to add performance metrics to log records"""
 
     def filter(self, record: logging.LogRecord) -> bool:
-        # Add performance context if available
-        if hasattr(record, 'duration'):
-            record.duration_ms = record.duration * 1000
+        # Add performance context if available; most records carry none
+        duration = record.__dict__.get('duration')
+        if duration is not None:
+            record.duration_ms = duration * 1000
         return True
 
 class SecurityFilter(logging.Filter):
@@ -130,16 +172,124 @@ class SecurityFilter(logging.Filter):
         'authorization', 'cookie', 'session'
     ]
 
+    # One case-insensitive pass over the message instead of a lower() copy per field
+    _PATTERN = re.compile('|'.join(map(re.escape, SENSITIVE_FIELDS)), re.IGNORECASE)
+
     def filter(self, record: logging.LogRecord) -> bool:
-        # Redact sensitive information from message
-        message = record.getMessage()
-        for field in self.SENSITIVE_FIELDS:
-            if field in message.lower():
-                # Simple redaction - in production use more sophisticated methods
-                record.msg = record.msg.replace(field, f"{field}=***REDACTED***")
+        # Redact sensitive information from message. Only msg is rewritten, so
+        # scan it directly rather than paying for getMessage()'s % formatting.
+        msg = record.msg
+        if isinstance(msg, str) and self._PATTERN.search(msg):
+            # Simple redaction - in production use more sophisticated methods
+            record.msg = self._PATTERN.sub(r"\g<0>=***REDACTED***", msg)
 
         return True
 
+def _format_line(handler: logging.Handler, record: logging.LogRecord) -> bytes:
+    """Encoded log line; StructuredFormatter output skips the str round trip"""
+    formatter = handler.formatter
+    if isinstance(formatter, StructuredFormatter):
+        return formatter.format_bytes(record) + b"\n"
+    return (handler.format(record) + "\n").encode('utf-8')
+
+class BytesStreamHandler(logging.StreamHandler):
+    """
+    Stream handler that writes formatted bytes to the stream's binary buffer
+
+    StreamHandler would decode orjson's bytes to str only for the text layer
+    to encode them again. Streams without a buffer fall back to the text path.
+    """
+
+    def emit(self, record: logging.LogRecord) -> None:
+        buffer = getattr(self.stream, 'buffer', None)
+        if buffer is None:
+            super().emit(record)
+            return
+        try:
+            buffer.write(_format_line(self, record))
+            self.flush()
+        except RecursionError:
+            raise
+        except Exception:
+            self.handleError(record)
+
+class BufferedRotatingFileHandler(logging.handlers.RotatingFileHandler):
+    """
+    Rotating file handler that writes through a 64KB buffer
+
+    RotatingFileHandler issues a write() syscall (and a size probe) per record;
+    here records accumulate in the buffer and a background thread flushes it
+    every flush_interval seconds, bounding how stale the file can get.
+    """
+
+    BUFFER_SIZE = 65536
+
+    def __init__(self, filename, maxBytes=0, backupCount=0, flush_interval: float = 0.2):
+        super().__init__(filename, maxBytes=maxBytes, backupCount=backupCount, delay=True)
+        self._size = 0
+        self._stop_flushing = threading.Event()
+        self._flusher = threading.Thread(
+            target=self._flush_periodically,
+            args=(flush_interval,),
+            name="log-file-flusher",
+            daemon=True
+        )
+        self._flusher.start()
+
+    def _open(self):
+        stream = open(self.baseFilename, 'ab', buffering=self.BUFFER_SIZE)
+        # Track the size ourselves; tell() on a text stream would force a flush
+        self._size = stream.seek(0, os.SEEK_END)
+        return stream
+
+    def emit(self, record: logging.LogRecord) -> None:
+        try:
+            data = _format_line(self, record)
+            if self.stream is not None and self.maxBytes > 0 \
+                    and self._size + len(data) >= self.maxBytes:
+                self.doRollover()
+            # delay=True: opened lazily, and doRollover leaves it closed
+            if self.stream is None:
+                self.stream = self._open()
+            self.stream.write(data)
+            self._size += len(data)
+        except Exception:
+            self.handleError(record)
+
+    def _flush_periodically(self, interval: float) -> None:
+        while not self._stop_flushing.wait(interval):
+            self.flush()
+
+    def close(self) -> None:
+        self._stop_flushing.set()
+        super().close()
+
+class _StructuredQueueHandler(logging.handlers.QueueHandler):
+    """
+    Queue handler that hands records to the listener thread intact
+
+    The stock prepare() pre-formats the record and drops exc_info, which would
+    bypass StructuredFormatter; here we only merge args, since they may be
+    mutated after the logging call returns. Request context is stamped by
+    ContextFilter on this handler, before the record leaves the logging thread.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+_listener: Optional[logging.handlers.QueueListener] = None
+
+def _stop_listener() -> None:
+    """Drain the log queue and stop the background listener, if running"""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+atexit.register(_stop_listener)
+
 def setup_logging(
     service_name: str,
     level: str = "INFO",
@@ -157,7 +307,7 @@ def setup_logging(
         enable_file: Enable file output
         log_file: Path to log file
     """
-    import os
+    global _listener
 
     # Set service name in environment
     os.environ['SERVICE_NAME'] = service_name
@@ -168,29 +318,45 @@ def setup_logging(
 
     # Remove existing handlers
     root_logger.handlers = []
+    _stop_listener()
 
     # Create formatter
     formatter = StructuredFormatter()
 
+    # Real output handlers; they run on the queue listener thread
+    handlers = []
+
     # Add console handler
     if enable_console:
-        console_handler = logging.StreamHandler(sys.stdout)
+        console_handler = BytesStreamHandler(sys.stdout)
         console_handler.setFormatter(formatter)
-        console_handler.addFilter(PerformanceFilter())
-        console_handler.addFilter(SecurityFilter())
-        root_logger.addHandler(console_handler)
+        handlers.append(console_handler)
 
     # Add file handler
     if enable_file and log_file:
-        file_handler = logging.handlers.RotatingFileHandler(
+        file_handler = BufferedRotatingFileHandler(
             log_file,
             maxBytes=10485760,  # 10MB
             backupCount=5
         )
         file_handler.setFormatter(formatter)
-        file_handler.addFilter(PerformanceFilter())
-        file_handler.addFilter(SecurityFilter())
-        root_logger.addHandler(file_handler)
+        handlers.append(file_handler)
+
+    # Request threads only filter and enqueue; formatting and writes happen in the background
+    if handlers:
+        log_queue = queue.SimpleQueue()
+        queue_handler = _StructuredQueueHandler(log_queue)
+        # Filters live on the single queue handler so they run once per record,
+        # however many output handlers there are. (Root logger filters would
+        # miss records propagated up from named loggers.)
+        queue_handler.addFilter(ContextFilter())
+        queue_handler.addFilter(PerformanceFilter())
+        queue_handler.addFilter(SecurityFilter())
+        root_logger.addHandler(queue_handler)
+        _listener = logging.handlers.QueueListener(
+            log_queue, *handlers, respect_handler_level=True
+        )
+        _listener.start()
 
     # Configure third-party loggers
     logging.getLogger('uvicorn').setLevel(logging.WARNING)
@@ -212,43 +378,20 @@ def setup_logging(
         }
     )
 
-class LoggerAdapter(logging.LoggerAdapter):
-    """
-    Logger adapter to inject request context into all log messages
-    Used for distributed tracing
-    """
-
-    def process(self, msg, kwargs):
-        # Add trace context to extra fields
-        extra = kwargs.get('extra', {})
-
-        request_id = request_id_var.get()
-        if request_id:
-            extra['request_id'] = request_id
-
-        correlation_id = correlation_id_var.get()
-        if correlation_id:
-            extra['correlation_id'] = correlation_id
-
-        user_id = user_id_var.get()
-        if user_id:
-            extra['user_id'] = user_id
-
-        kwargs['extra'] = extra
-        return msg, kwargs
-
-def get_logger(name: str) -> LoggerAdapter:
+def get_logger(name: str) -> logging.Logger:
     """
     Get a logger instance with request context support
 
+    Request context is attached by the ContextFilter installed in
+    setup_logging, so plain loggers carry it without a per-call adapter.
+
     Args:
         name: Logger name (usually __name__)
 
     Returns:
-        LoggerAdapter with context injection
+        Logger for the given name
     """
-    base_logger = logging.getLogger(name)
-    return LoggerAdapter(base_logger, {})
+    return logging.getLogger(name)
 
 def set_request_context(
     request_id: Optional[str] = None,
@@ -263,12 +406,13 @@ def set_request_context(
         correlation_id: Correlation ID for distributed tracing
         user_id: User identifier
     """
-    if request_id:
-        request_id_var.set(request_id)
-    if correlation_id:
-        correlation_id_var.set(correlation_id)
-    if user_id:
-        user_id_var.set(user_id)
+    # Values not given keep whatever is already set, as separate vars did
+    current = _trace_ctx_var.get()
+    _trace_ctx_var.set(TraceContext(
+        request_id=request_id or current.request_id,
+        correlation_id=correlation_id or current.correlation_id,
+        user_id=user_id or current.user_id,
+    ))
 
 def generate_request_id() -> str:
     """Generate a unique request ID"""
@@ -276,16 +420,33 @@ def generate_request_id() -> str:
 
 # Middleware for FastAPI
 
-class RequestLoggingMiddleware(BaseHTTPMiddleware):
+class RequestLoggingMiddleware:
     """
     Middleware to log all requests and responses
     Adds request ID and tracks request duration
+
+    Implemented as plain ASGI rather than BaseHTTPMiddleware so responses are
+    passed straight through (no task group, no body buffering, streaming intact).
     """
 
-    async def dispatch(self, request: Request, call_next) -> Response:
+    def __init__(self, app):
+        self.app = app
+        self.logger = get_logger(__name__)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
         # Generate or extract request ID
-        request_id = request.headers.get('X-Request-ID', generate_request_id())
-        correlation_id = request.headers.get('X-Correlation-ID')
+        request_id = None
+        correlation_id = None
+        for name, value in scope["headers"]:
+            if name == b"x-request-id":
+                request_id = value.decode("latin-1")
+            elif name == b"x-correlation-id":
+                correlation_id = value.decode("latin-1")
+        request_id = request_id or generate_request_id()
 
         # Set context
         set_request_context(
@@ -293,56 +454,65 @@ class RequestLoggingMiddleware(BaseHTTPMiddleware):
             correlation_id=correlation_id
         )
 
+        method = scope["method"]
+        path = scope["path"]
+        client = scope.get("client")
+
         # Log request
-        logger = get_logger(__name__)
-        logger.info(
-            f"Request started: {request.method} {request.url.path}",
+        self.logger.info(
+            f"Request started: {method} {path}",
             extra={
                 'extra_fields': {
-                    'method': request.method,
-                    'path': request.url.path,
-                    'client_host': request.client.host if request.client else None
+                    'method': method,
+                    'path': path,
+                    'client_host': client[0] if client else None
                 }
             }
         )
 
+        status_code = None
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                # Add request ID to response headers
+                headers = list(message.get("headers", []))
+                headers.append((b"x-request-id", request_id.encode("latin-1")))
+                message = {**message, "headers": headers}
+            await send(message)
+
         # Process request
-        import time
         start_time = time.time()
 
         try:
-            response = await call_next(request)
+            await self.app(scope, receive, send_wrapper)
+        except Exception:
             duration = time.time() - start_time
-
-            # Log response
-            logger.info(
-                f"Request completed: {request.method} {request.url.path}",
+            self.logger.error(
+                f"Request failed: {method} {path}",
+                exc_info=True,
                 extra={
                     'extra_fields': {
-                        'method': request.method,
-                        'path': request.url.path,
-                        'status_code': response.status_code,
+                        'method': method,
+                        'path': path,
                         'duration_ms': duration * 1000
                     }
                 }
             )
+            raise
 
-            # Add request ID to response headers
-            response.headers['X-Request-ID'] = request_id
-
-            return response
+        duration = time.time() - start_time
 
-        except Exception as e:
-            duration = time.time() - start_time
-            logger.error(
-                f"Request failed: {request.method} {request.url.path}",
-                exc_info=True,
-                extra={
-                    'extra_fields': {
-                        'method': request.method,
-                        'path': request.url.path,
-                        'duration_ms': duration * 1000
-                    }
+        # Log response
+        self.logger.info(
+            f"Request completed: {method} {path}",
+            extra={
+                'extra_fields': {
+                    'method': method,
+                    'path': path,
+                    'status_code': status_code,
+                    'duration_ms': duration * 1000
                 }
-            )
-            raise
+            }
+        )
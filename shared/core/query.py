@@ -0,0 +1,17 @@
+"""
+Query helpers shared by the list endpoints.
+"""
+
+from typing import Any, Iterable, List
+
+
+def order_clauses(model: Any, order_by: Iterable[str], sortable: set) -> List[Any]:
+    """Translate ["-col", "col2"] into ORDER BY clauses, rejecting unknown columns."""
+    clauses = []
+    for key in order_by:
+        name = key[1:] if key.startswith('-') else key
+        if name not in sortable:
+            raise ValueError(f"Cannot order by '{name}'")
+        column = getattr(model, name)
+        clauses.append(column.desc() if key.startswith('-') else column.asc())
+    return clauses
@@ -4,6 +4,7 @@ Tests all services end-to-end functionality
 """
 
 import pytest
+import pytest_asyncio
 import httpx
 import asyncio
 import json
@@ -12,47 +13,51 @@ from typing import Dict, Any, Optional
 
 # Configuration
 BASE_URL = "http://localhost:8080"
-HEALTH_CHECK_RETRIES = 30
-HEALTH_CHECK_DELAY = 2
+# Exponential backoff from 50ms capped at 1s; 60 attempts keeps the old ~60s budget
+HEALTH_CHECK_RETRIES = 60
+HEALTH_CHECK_INITIAL_DELAY = 0.05
+HEALTH_CHECK_MAX_DELAY = 1.0
 
+@pytest.mark.asyncio(scope="class")
 class TestPlatformIntegration:
     """Integration tests for the microservices platform"""
     
-    @classmethod
-    def setup_class(cls):
-        """Setup before all tests"""
-        cls.client = httpx.Client(base_url=BASE_URL, timeout=30.0)
+    @pytest_asyncio.fixture(scope="class", autouse=True)
+    async def platform(self, request):
+        """Setup before all tests, cleanup after"""
+        cls = request.cls
+        # One client (and connection pool) shared by every test on the class loop
+        cls.client = httpx.AsyncClient(base_url=BASE_URL, timeout=30.0)
         cls.token = None
-        cls.wait_for_services()
-        cls.authenticate()
-    
-    @classmethod
-    def teardown_class(cls):
-        """Cleanup after all tests"""
-        cls.client.close()
+        await cls.wait_for_services()
+        await cls.authenticate()
+        yield
+        await cls.client.aclose()
     
     @classmethod
-    def wait_for_services(cls):
+    async def wait_for_services(cls):
         """Wait for all services to be healthy"""
         print("Waiting for services to be ready...")
         
+        delay = HEALTH_CHECK_INITIAL_DELAY
         for attempt in range(HEALTH_CHECK_RETRIES):
             try:
-                response = cls.client.get("/health")
+                response = await cls.client.get("/health")
                 if response.status_code == 200:
                     print("Gateway service is ready")
                     return
             except Exception as e:
                 print(f"Attempt {attempt + 1}/{HEALTH_CHECK_RETRIES}: {e}")
             
-            time.sleep(HEALTH_CHECK_DELAY)
+            await asyncio.sleep(delay)
+            delay = min(delay * 1.7, HEALTH_CHECK_MAX_DELAY)
         
         raise Exception("Services failed to start within timeout period")
     
     @classmethod
-    def authenticate(cls):
+    async def authenticate(cls):
         """Get authentication token"""
-        response = cls.client.post(
+        response = await cls.client.post(
             "/auth/token",
             data={"username": "testuser"}
         )
@@ -62,7 +67,7 @@ class TestPlatformIntegration:
         cls.headers = {"Authorization": f"Bearer {cls.token}"}
         print(f"Authenticated successfully")
     
-    def test_health_endpoints(self):
+    async def test_health_endpoints(self):
         """Test health check endpoints for all services"""
         endpoints = [
             "/health",
@@ -70,21 +75,23 @@ class TestPlatformIntegration:
             "/health/ready"
         ]
         
-        for endpoint in endpoints:
-            response = self.client.get(endpoint)
+        responses = await asyncio.gather(
+            *(self.client.get(endpoint) for endpoint in endpoints)
+        )
+        for response in responses:
             assert response.status_code in [200, 503]
             data = response.json()
             assert "status" in data
     
-    def test_metrics_endpoint(self):
+    async def test_metrics_endpoint(self):
         """Test metrics endpoint"""
-        response = self.client.get("/metrics")
+        response = await self.client.get("/metrics")
         assert response.status_code == 200
         data = response.json()
         assert "service" in data
         assert "uptime_seconds" in data
     
-    def test_customers_crud(self):
+    async def test_customers_crud(self):
         """Test Customers service CRUD operations"""
         # Create customer
         customer_data = {
@@ -92,7 +99,7 @@ class TestPlatformIntegration:
             "email": "test@example.com"
         }
         
-        response = self.client.post(
+        response = await self.client.post(
             "/customers/",
             json=customer_data,
             headers=self.headers
@@ -103,7 +110,7 @@ class TestPlatformIntegration:
         customer_id = created_customer["id"]
         
         # Get all customers
-        response = self.client.get("/customers/", headers=self.headers)
+        response = await self.client.get("/customers/", headers=self.headers)
         assert response.status_code == 200
         customers = response.json()
         assert isinstance(customers, list)
@@ -112,7 +119,7 @@ class TestPlatformIntegration:
         customer_ids = [c["id"] for c in customers]
         assert customer_id in customer_ids
     
-    def test_products_crud(self):
+    async def test_products_crud(self):
         """Test Products service CRUD operations"""
         # Create product
         product_data = {
@@ -123,7 +130,7 @@ class TestPlatformIntegration:
             "is_active": True
         }
         
-        response = self.client.post(
+        response = await self.client.post(
             "/products/",
             json=product_data,
             headers=self.headers
@@ -134,12 +141,12 @@ class TestPlatformIntegration:
         product_id = created_product["id"]
         
         # Get all products
-        response = self.client.get("/products/", headers=self.headers)
+        response = await self.client.get("/products/", headers=self.headers)
         assert response.status_code == 200
         products = response.json()
         assert isinstance(products, list)
     
-    def test_inventory_management(self):
+    async def test_inventory_management(self):
         """Test Inventory service operations"""
         # Create inventory entry
         inventory_data = {
@@ -149,7 +156,7 @@ class TestPlatformIntegration:
             "reserved": 10
         }
         
-        response = self.client.post(
+        response = await self.client.post(
             "/inventory/",
             json=inventory_data,
             headers=self.headers
@@ -167,14 +174,14 @@ class TestPlatformIntegration:
                 "reserved": 20
             }
             
-            response = self.client.put(
+            response = await self.client.put(
                 f"/inventory/{created_inventory['id']}",
                 json=update_data,
                 headers=self.headers
             )
             assert response.status_code in [200, 404]
     
-    def test_order_workflow(self):
+    async def test_order_workflow(self):
         """Test complete order workflow"""
         # Create order
         order_data = {
@@ -192,7 +199,7 @@ class TestPlatformIntegration:
             ]
         }
         
-        response = self.client.post(
+        response = await self.client.post(
             "/orders/",
             json=order_data,
             headers=self.headers
@@ -210,13 +217,6 @@ class TestPlatformIntegration:
                 "status": "PAID"
             }
             
-            response = self.client.post(
-                "/payments/",
-                json=payment_data,
-                headers=self.headers
-            )
-            assert response.status_code in [201, 400]
-            
             # Create shipment
             shipment_data = {
                 "order_id": order_id,
@@ -225,14 +225,23 @@ class TestPlatformIntegration:
                 "tracking_no": f"TRACK-{int(time.time())}"
             }
             
-            response = self.client.post(
-                "/shipments/",
-                json=shipment_data,
-                headers=self.headers
+            # Payment and shipment only depend on the order, not on each other
+            payment_response, shipment_response = await asyncio.gather(
+                self.client.post(
+                    "/payments/",
+                    json=payment_data,
+                    headers=self.headers
+                ),
+                self.client.post(
+                    "/shipments/",
+                    json=shipment_data,
+                    headers=self.headers
+                )
             )
-            assert response.status_code in [201, 400]
+            assert payment_response.status_code in [201, 400]
+            assert shipment_response.status_code in [201, 400]
     
-    def test_graphql_queries(self):
+    async def test_graphql_queries(self):
         """Test GraphQL endpoint"""
         # Simple query
         query = """
@@ -250,7 +259,7 @@ class TestPlatformIntegration:
         }
         """
         
-        response = self.client.post(
+        response = await self.client.post(
             "/graphql",
             json={"query": query},
             headers=self.headers
@@ -261,7 +270,7 @@ class TestPlatformIntegration:
         assert "customers" in data["data"]
         assert "products" in data["data"]
     
-    def test_graphql_nested_queries(self):
+    async def test_graphql_nested_queries(self):
         """Test GraphQL nested queries"""
         query = """
         query {
@@ -289,7 +298,7 @@ class TestPlatformIntegration:
         }
         """
         
-        response = self.client.post(
+        response = await self.client.post(
             "/graphql",
             json={"query": query},
             headers=self.headers
@@ -299,18 +308,18 @@ class TestPlatformIntegration:
         assert "data" in data
         assert "orders" in data["data"]
     
-    def test_caching_behavior(self):
+    async def test_caching_behavior(self):
         """Test that caching is working"""
         # First request
         start = time.time()
-        response1 = self.client.get("/customers/", headers=self.headers)
+        response1 = await self.client.get("/customers/", headers=self.headers)
         time1 = time.time() - start
         assert response1.status_code == 200
         data1 = response1.json()
         
         # Second request (should be cached)
         start = time.time()
-        response2 = self.client.get("/customers/", headers=self.headers)
+        response2 = await self.client.get("/customers/", headers=self.headers)
         time2 = time.time() - start
         assert response2.status_code == 200
         data2 = response2.json()
@@ -322,27 +331,58 @@ class TestPlatformIntegration:
         # Note: This might not always be true in test environments
         print(f"First request: {time1:.3f}s, Cached request: {time2:.3f}s")
     
-    def test_error_handling(self):
-        """Test error handling"""
-        # Test unauthorized access
-        response = self.client.get("/customers/")
-        assert response.status_code == 401
+    async def test_write_status_passthrough(self):
+        """Test that writes through the gateway keep the downstream status and body"""
+        customer_data = {
+            "name": "Passthrough Customer",
+            "email": f"passthrough-{time.time_ns()}@example.com",
+            "address_street": "1 Main St",
+            "address_city": "Springfield",
+            "address_state": "IL",
+            "address_zip": "62701"
+        }
+        response = await self.client.post(
+            "/customers/",
+            json=customer_data,
+            headers=self.headers
+        )
+        # Created is reported as 201 (not a normalized 200), with the downstream JSON body
+        assert response.status_code == 201
+        assert response.headers["content-type"].startswith("application/json")
+        assert "id" in response.json()
         
-        # Test invalid endpoint
-        response = self.client.get("/invalid/", headers=self.headers)
+        # Downstream errors on writes surface with their own status
+        response = await self.client.put(
+            "/customers/999999999",
+            json=customer_data,
+            headers=self.headers
+        )
         assert response.status_code == 404
         
-        # Test invalid data
-        response = self.client.post(
-            "/customers/",
-            json={"invalid": "data"},
-            headers=self.headers
+        response = await self.client.delete("/customers/999999999", headers=self.headers)
+        assert response.status_code == 404
+    
+    async def test_error_handling(self):
+        """Test error handling"""
+        unauthorized, invalid_endpoint, invalid_data = await asyncio.gather(
+            # Test unauthorized access
+            self.client.get("/customers/"),
+            # Test invalid endpoint
+            self.client.get("/invalid/", headers=self.headers),
+            # Test invalid data
+            self.client.post(
+                "/customers/",
+                json={"invalid": "data"},
+                headers=self.headers
+            )
         )
-        assert response.status_code in [400, 422]
+        assert unauthorized.status_code == 401
+        assert invalid_endpoint.status_code == 404
+        assert invalid_data.status_code in [400, 422]
     
-    def test_request_tracking(self):
+    async def test_request_tracking(self):
         """Test request ID tracking"""
-        response = self.client.get("/customers/", headers=self.headers)
+        response = await self.client.get("/customers/", headers=self.headers)
         assert response.status_code == 200
         
         # Check if X-Request-ID is in response headers
@@ -352,7 +392,7 @@ class TestPlatformIntegration:
             print(f"Request tracked with ID: {request_id}")
     
     @pytest.mark.performance
-    def test_performance_baseline(self):
+    async def test_performance_baseline(self):
         """Test performance baselines"""
         endpoints = [
             "/customers/",
@@ -363,9 +403,11 @@ class TestPlatformIntegration:
             "/shipments/"
         ]
         
+        # Timed one at a time: concurrent calls would fold queueing behind each other
+        # into every measurement instead of single-request latency
         for endpoint in endpoints:
             start = time.time()
-            response = self.client.get(endpoint, headers=self.headers)
+            response = await self.client.get(endpoint, headers=self.headers)
             duration = time.time() - start
             
             assert response.status_code == 200